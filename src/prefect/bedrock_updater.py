@@ -1,31 +1,167 @@
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import errno
+import hashlib
 import os
 import re
 import shutil
 import tempfile
+import json
 import time
+import urllib.error
 import urllib.request
 import zipfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
+
+import httpx
 
 
 DEFAULT_BEDROCK_DOWNLOAD_PAGE_URL = "https://www.minecraft.net/en-us/download/server/bedrock"
 DEFAULT_BEDROCK_DOWNLOAD_LINKS_API_URL = "https://net-secondary.web.minecraft-services.net/api/v1.0/download/links"
 
+# Copy buffer for the server zip download (~100 MB) and extraction; much larger than shutil's default.
+_COPY_BUFFER_SIZE = 1024 * 1024
+# Parallel HTTP Range requests used for the zip download when the host supports them.
+_DOWNLOAD_RANGE_PARTS = 8
+# Worker threads for extraction/install; file copies are I/O-bound and release the GIL.
+_IO_WORKERS = 8
+_DOWNLOAD_HEADERS = {
+    "User-Agent": "Prefect/BedrockUpdater",
+    # The payload is already a zip; don't let anything re-compress it in transit.
+    "Accept-Encoding": "identity",
+}
+
+# One pass over the download page for any Bedrock Linux zip link. Host preference, best first:
+#   www.minecraft.net/bedrockdedicatedserver  (modern stable hosting)
+#   minecraft.azureedge.net                   (legacy CDN hosting)
+#   anything else
+_COMBINED_BEDROCK_PAT = re.compile(
+    r"https?://(?:(?P<mc>www\.minecraft\.net/bedrockdedicatedserver)|(?P<cdn>minecraft\.azureedge\.net)|[^\"'<>\s]+)"
+    r"/bin-linux/bedrock-server-[^\"'<>\s]+\.zip",
+    re.IGNORECASE,
+)
+
+
+def _rank_bedrock_url(m: re.Match[str]) -> int:
+    return 0 if m.group("mc") else 1 if m.group("cdn") else 2
+
+
+# Case-insensitive like _COMBINED_BEDROCK_PAT, so an upper-case link is never skipped.
+_BEDROCK_URL_NEEDLE = re.compile(re.escape("/bin-linux/bedrock-server-"), re.IGNORECASE)
+_NEEDLE_WINDOW_BEFORE = 256
+_NEEDLE_WINDOW_AFTER = 256
+
+
+def _iter_bedrock_url_matches(html: str) -> Iterator[re.Match[str]]:
+    """Yield Bedrock zip URL matches in page order.
+
+    The download page is large and the links are few, so the regex only runs
+    in a small window around each occurrence of the path segment (matched
+    case-insensitively, like the URL pattern). If that finds nothing (e.g. a
+    very long URL), scan the page.
+    """
+    found = False
+    prev_end = 0
+    hit = _BEDROCK_URL_NEEDLE.search(html)
+    while hit is not None:
+        idx = hit.start()
+        start = max(prev_end, idx - _NEEDLE_WINDOW_BEFORE)
+        m = _COMBINED_BEDROCK_PAT.search(html, start, idx + _NEEDLE_WINDOW_AFTER)
+        if m:
+            found = True
+            prev_end = m.end()
+            yield m
+        hit = _BEDROCK_URL_NEEDLE.search(html, max(prev_end, idx + 1))
+    if not found:
+        yield from _COMBINED_BEDROCK_PAT.finditer(html)
+
+
+# Conditional-GET state for the download-links API (ETag/Last-Modified + last URL).
+_API_CACHE_PATH = Path.home() / ".cache" / "prefect" / "bedrock_api.json"
+# In-process memo of resolved download URLs: page_url -> (monotonic time, url).
+_URL_CACHE_TTL_SECONDS = 3600.0
+_url_cache: dict[str, tuple[float, str]] = {}
+
 
 @dataclass(frozen=True)
 class BedrockUpdateResult:
     download_url: str
-    backup_dir: Path
+    # None when nothing was installed (the same zip was already in place).
+    backup_dir: Path | None
 
 
 def _default_logger(_: str) -> None:
     return
 
 
+def _read_api_cache() -> dict:
+    try:
+        data = json.loads(_API_CACHE_PATH.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _write_api_cache(data: dict) -> None:
+    try:
+        _API_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _API_CACHE_PATH.write_text(json.dumps(data), encoding="utf-8")
+    except Exception:
+        # Caching is best-effort.
+        pass
+
+
+def _query_download_links_api(timeout_seconds: float) -> str | None:
+    """Ask the download-links API for the Linux server zip, revalidating our cached answer.
+
+    Sends If-None-Match/If-Modified-Since from the last response; a 304 returns the cached URL.
+    """
+
+    cache = _read_api_cache()
+    headers = {
+        "User-Agent": "Prefect/BedrockUpdater",
+        "Accept": "application/json",
+    }
+    if cache.get("url"):
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+
+    req = urllib.request.Request(DEFAULT_BEDROCK_DOWNLOAD_LINKS_API_URL, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout_seconds) as resp:
+            raw = resp.read()
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+    except urllib.error.HTTPError as exc:
+        if exc.code == 304 and cache.get("url"):
+            return cache["url"]
+        raise
+
+    text = raw.decode("utf-8", errors="replace")
+    # Response shape observed:
+    # {"result": {"links": [{"downloadType": "serverBedrockLinux", "downloadUrl": "...zip"}, ...]}}
+    payload = json.loads(text)
+    links = (payload or {}).get("result", {}).get("links", [])
+    for link in links:
+        if (link.get("downloadType") or "").lower() == "serverbedrocklinux":
+            u = link.get("downloadUrl")
+            if isinstance(u, str) and u.startswith("http") and u.endswith(".zip"):
+                _write_api_cache({
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "url": u,
+                    "fetched_at": time.time(),
+                })
+                return u
+    return None
+
+
 def find_latest_bedrock_linux_download_url(
     *,
     page_url: str = DEFAULT_BEDROCK_DOWNLOAD_PAGE_URL,
@@ -35,32 +171,24 @@ def find_latest_bedrock_linux_download_url(
 
     Preferred method: query the public download-links API used by minecraft.net.
     Fallback: attempt to scrape the download page (best-effort).
+    Results are remembered in-process for an hour.
     """
 
+    cached = _url_cache.get(page_url)
+    if cached is not None and time.monotonic() - cached[0] < _URL_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    url = _find_latest_bedrock_linux_download_url(page_url=page_url, timeout_seconds=timeout_seconds)
+    _url_cache[page_url] = (time.monotonic(), url)
+    return url
+
+
+def _find_latest_bedrock_linux_download_url(*, page_url: str, timeout_seconds: float) -> str:
     # 1) Preferred: stable API that returns downloadType -> downloadUrl mappings.
     try:
-        req = urllib.request.Request(
-            DEFAULT_BEDROCK_DOWNLOAD_LINKS_API_URL,
-            headers={
-                "User-Agent": "Prefect/BedrockUpdater",
-                "Accept": "application/json",
-            },
-        )
-        with urllib.request.urlopen(req, timeout=timeout_seconds) as resp:
-            raw = resp.read()
-
-        text = raw.decode("utf-8", errors="replace")
-        # Response shape observed:
-        # {"result": {"links": [{"downloadType": "serverBedrockLinux", "downloadUrl": "...zip"}, ...]}}
-        import json
-
-        payload = json.loads(text)
-        links = (payload or {}).get("result", {}).get("links", [])
-        for link in links:
-            if (link.get("downloadType") or "").lower() == "serverbedrocklinux":
-                u = link.get("downloadUrl")
-                if isinstance(u, str) and u.startswith("http") and u.endswith(".zip"):
-                    return u
+        u = _query_download_links_api(timeout_seconds)
+        if u:
+            return u
     except Exception:
         # Fall back to page scraping below.
         pass
@@ -79,18 +207,16 @@ def find_latest_bedrock_linux_download_url(
 
     html = raw.decode("utf-8", errors="replace")
 
-    patterns = (
-        # Modern stable hosting (minecraft.net domain)
-        r"https?://www\.minecraft\.net/bedrockdedicatedserver/bin-linux/bedrock-server-[^\"'<>\s]+\.zip",
-        # Legacy CDN hosting
-        r"https?://minecraft\.azureedge\.net/bin-linux/bedrock-server-[^\"'<>\s]+\.zip",
-        r"https?://[^\"'<>\s]+/bin-linux/bedrock-server-[^\"'<>\s]+\.zip",
-    )
-
-    for pat in patterns:
-        m = re.search(pat, html, flags=re.IGNORECASE)
-        if m:
-            return m.group(0)
+    best: str | None = None
+    best_rank = 3
+    for m in _iter_bedrock_url_matches(html):
+        rank = _rank_bedrock_url(m)
+        if rank < best_rank:
+            best, best_rank = m.group(0), rank
+            if rank == 0:
+                break
+    if best is not None:
+        return best
 
     raise RuntimeError(
         "Could not determine the latest Bedrock Linux server download URL. "
@@ -98,6 +224,154 @@ def find_latest_bedrock_linux_download_url(
     )
 
 
+class _RangesNotSupported(Exception):
+    pass
+
+
+async def _download_ranged(
+    url: str,
+    dst: Path,
+    *,
+    num_chunks: int = _DOWNLOAD_RANGE_PARTS,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> None:
+    """Download url into dst using parallel HTTP Range requests.
+
+    Raises _RangesNotSupported if the server doesn't advertise/honour byte ranges,
+    so the caller can fall back to a single stream. Failures inside the parallel
+    fetch arrive wrapped in an ExceptionGroup.
+    """
+
+    timeout = httpx.Timeout(60.0)
+    async with httpx.AsyncClient(
+        headers=_DOWNLOAD_HEADERS, timeout=timeout, follow_redirects=True, transport=transport
+    ) as client:
+        head = await client.head(url)
+        head.raise_for_status()
+        size = int(head.headers.get("Content-Length") or 0)
+        if size <= 0 or head.headers.get("Accept-Ranges", "").lower() != "bytes":
+            raise _RangesNotSupported(url)
+
+        final_url = str(head.url)
+        part = -(-size // num_chunks)
+
+        fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+
+            async def _fetch(start: int, end: int) -> None:
+                headers = {"Range": f"bytes={start}-{end}"}
+                async with client.stream("GET", final_url, headers=headers) as resp:
+                    if resp.status_code != 206:
+                        raise _RangesNotSupported(final_url)
+                    offset = start
+                    async for chunk in resp.aiter_bytes(_COPY_BUFFER_SIZE):
+                        os.pwrite(fd, chunk, offset)
+                        offset += len(chunk)
+                if offset != end + 1:
+                    raise RuntimeError(f"Short read for range {start}-{end} ({offset - start} bytes)")
+
+            async with asyncio.TaskGroup() as tg:
+                for start in range(0, size, part):
+                    tg.create_task(_fetch(start, min(start + part, size) - 1))
+        finally:
+            os.close(fd)
+
+
+def _download_single(url: str, dst: Path) -> None:
+    req = urllib.request.Request(url, headers=_DOWNLOAD_HEADERS)
+    with urllib.request.urlopen(req, timeout=60.0) as resp, dst.open("wb") as f:
+        shutil.copyfileobj(resp, f, length=_COPY_BUFFER_SIZE)
+
+
+def _download(url: str, dst: Path, log: Callable[[str], None]) -> None:
+    """Download url into dst, in parallel ranges when possible."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        # asyncio.run() can't be nested inside a running loop.
+        log("[BDS:UPDATE] called from a running event loop; using a single stream")
+        _download_single(url, dst)
+        return
+    try:
+        asyncio.run(_download_ranged(url, dst))
+        return
+    except* _RangesNotSupported:
+        log("[BDS:UPDATE] server does not support ranged download; using a single stream")
+    except* Exception as group:
+        reasons = "; ".join(str(exc) for exc in group.exceptions)
+        log(f"[BDS:UPDATE] ranged download failed ({reasons}); retrying with a single stream")
+    _download_single(url, dst)
+
+
+def _member_target(dest: Path, zi: zipfile.ZipInfo) -> Path:
+    """Where zipfile would extract zi under dest (drops absolute/'.'/'..' parts)."""
+    parts = [p for p in zi.filename.split("/") if p not in ("", ".", "..")]
+    return dest.joinpath(*parts)
+
+
+def _extract_member(zf: zipfile.ZipFile, zi: zipfile.ZipInfo, target: Path) -> None:
+    with zf.open(zi) as src, open(target, "wb") as dst:
+        shutil.copyfileobj(src, dst, _COPY_BUFFER_SIZE)
+    # Unix permission bits, if the archive was built on a Unix host.
+    mode = (zi.external_attr >> 16) & 0o777
+    if mode:
+        os.chmod(target, mode)
+
+
+def _extract_all(zf: zipfile.ZipFile, dest: Path) -> None:
+    """Extract every member of zf into dest, writing files in parallel."""
+    files: list[tuple[zipfile.ZipInfo, Path]] = []
+    # Create the directory tree up front so workers never race on makedirs.
+    for zi in zf.infolist():
+        target = _member_target(dest, zi)
+        if zi.is_dir():
+            target.mkdir(parents=True, exist_ok=True)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            files.append((zi, target))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=_IO_WORKERS) as ex:
+        list(ex.map(lambda item: _extract_member(zf, *item), files))
+
+
+def _move_into_place(src: Path, dest: Path, *, is_dir: bool | None = None) -> None:
+    """Rename src to dest (a metadata-only op); copy instead if they're on different filesystems."""
+    try:
+        os.replace(src, dest)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        if src.is_dir() if is_dir is None else is_dir:
+            shutil.copytree(src, dest, dirs_exist_ok=True)
+        else:
+            shutil.copy2(src, dest)
+
+
+def _file_sha256(path: str | Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _read_manifest(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_manifest(path: Path, data: dict) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+    except OSError:
+        # The manifest only lets the next update skip work; losing it is harmless.
+        pass
+
+
 def update_bedrock_server_in_place(
     *,
     server_root: Path,
@@ -115,6 +389,8 @@ def update_bedrock_server_in_place(
     - allowlist.json
 
     Creates a backup directory under server_root/prefect_backups/ for any files it overwrites.
+    prefect_backups/manifest.json records the installed zip's SHA-256 and top-level entries, so
+    re-installing the same zip skips extraction entirely (and returns backup_dir=None).
     """
 
     root = Path(server_root)
@@ -138,23 +414,33 @@ def update_bedrock_server_in_place(
 
     ts = time.strftime("%Y%m%d-%H%M%S")
     backup_dir = root / "prefect_backups" / f"bedrock_update_{ts}"
-    backup_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = root / "prefect_backups" / "manifest.json"
+    manifest = _read_manifest(manifest_path)
 
-    with tempfile.TemporaryDirectory(prefix="prefect-bedrock-update-") as td:
+    # Stage inside server_root so installing is a rename on the same filesystem, not a copy.
+    with tempfile.TemporaryDirectory(prefix=".prefect-bedrock-update-", dir=root) as td:
         tmp_dir = Path(td)
         zip_path = tmp_dir / "bedrock_server.zip"
         extract_dir = tmp_dir / "extract"
         extract_dir.mkdir(parents=True, exist_ok=True)
 
         log("[BDS:UPDATE] downloading...")
-        req = urllib.request.Request(url, headers={"User-Agent": "Prefect/BedrockUpdater"})
-        with urllib.request.urlopen(req, timeout=60.0) as resp, zip_path.open("wb") as f:
-            shutil.copyfileobj(resp, f)
+        _download(url, zip_path, log)
         log(f"[BDS:UPDATE] downloaded_bytes={zip_path.stat().st_size}")
 
+        zip_sha256 = _file_sha256(zip_path)
+        installed = manifest.get("entries")
+        if (
+            manifest.get("zip_sha256") == zip_sha256
+            and isinstance(installed, (list, dict))
+            and all((root / name).exists() for name in installed)
+        ):
+            log("[BDS:UPDATE] already installed (zip unchanged); nothing to do")
+            return BedrockUpdateResult(download_url=url, backup_dir=None)
+
         log("[BDS:UPDATE] extracting...")
         with zipfile.ZipFile(zip_path) as zf:
-            zf.extractall(extract_dir)
+            _extract_all(zf, extract_dir)
 
         # Some zips may wrap content in a top-level folder; others don't.
         candidates = [extract_dir]
@@ -173,32 +459,38 @@ def update_bedrock_server_in_place(
 
         log(f"[BDS:UPDATE] installing_from={content_root}")
 
-        # Move aside any destination entries we are about to overwrite.
-        for src in content_root.iterdir():
-            name = src.name
-            if name in preserve_names:
-                continue
+        # One directory scan; DirEntry caches is_dir() from the dirent.
+        with os.scandir(content_root) as it:
+            entries = list(it)
+        replaced = [e for e in entries if e.name not in preserve_names]
+        preserved = [e for e in entries if e.name in preserve_names]
 
-            dest = root / name
+        def _replace_one(entry: os.DirEntry[str]) -> None:
+            # Move aside the destination entry we are about to overwrite, then swap in the new one.
+            # Both are renames within server_root, so this is cheap even for the pack directories.
+            dest = root / entry.name
             if dest.exists():
-                backup_target = backup_dir / name
+                backup_target = backup_dir / entry.name
                 backup_target.parent.mkdir(parents=True, exist_ok=True)
-                shutil.move(str(dest), str(backup_target))
-
-        # Copy in new version.
-        for src in content_root.iterdir():
-            name = src.name
-            if name in preserve_names:
-                # Keep existing worlds/config if present.
-                if (root / name).exists():
-                    continue
-
-            dest = root / name
-            if src.is_dir():
-                shutil.copytree(src, dest, dirs_exist_ok=True)
-            else:
-                dest.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src, dest)
+                os.replace(dest, backup_target)
+            _move_into_place(Path(entry.path), dest, is_dir=entry.is_dir())
+
+        def _add_missing(entry: os.DirEntry[str]) -> None:
+            # Keep existing worlds/config; only install defaults that aren't there yet.
+            dest = root / entry.name
+            if not dest.exists():
+                _move_into_place(Path(entry.path), dest, is_dir=entry.is_dir())
+
+        # Top-level entries are independent, so they can be handled concurrently.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=_IO_WORKERS) as ex:
+            list(ex.map(_replace_one, replaced))
+            list(ex.map(_add_missing, preserved))
+
+        log(f"[BDS:UPDATE] replaced={len(replaced)}")
+        _write_manifest(
+            manifest_path,
+            {"zip_sha256": zip_sha256, "entries": sorted(e.name for e in replaced)},
+        )
 
         # Ensure executable bit for the server binary.
         new_exe = root / "bedrock_server"
@@ -9,7 +9,7 @@ class CommandCatalogError(RuntimeError):
     pass
 
 
-_VALID_NAME = re.compile(r"^[A-Za-z0-9_.-]{1,32}$")
+_VALID_NAME = re.compile(r"[A-Za-z0-9_.-]{1,32}")  # used with fullmatch
 
 
 def load_command_names(path: Path | None) -> list[str]:
@@ -40,13 +40,15 @@ def load_command_names(path: Path | None) -> list[str]:
 
     names: list[str] = []
     seen: set[str] = set()
+    _match = _VALID_NAME.fullmatch
     for item in commands:
         if not isinstance(item, str):
             continue
         name = item.strip()
         if not name:
             continue
-        if not _VALID_NAME.match(name):
+        # Cheap length/ASCII checks reject most bad names before the regex runs.
+        if len(name) > 32 or not name.isascii() or not _match(name):
             raise CommandCatalogError(f"Invalid command name in catalog: {name!r}")
         if name not in seen:
             seen.add(name)
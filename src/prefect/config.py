@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 
 from pydantic import Field
@@ -107,5 +108,12 @@ class PrefectSettings(BaseSettings):
     discovery_allowlist_subdir: str = Field(default="allowlist")
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> PrefectSettings:
+    """Process-wide settings, read from the environment once."""
     return PrefectSettings()
+
+
+def reset_settings() -> None:
+    """Drop the cached settings so the next get_settings() re-reads the environment."""
+    get_settings.cache_clear()
@@ -7,16 +7,23 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import tempfile
+import threading
 import time
-from dataclasses import dataclass, field, asdict
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
+
+from prefect.json_codec import dumps as _dumps, loads as _loads
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ConversationMessage:
     """A single message in a conversation."""
     
@@ -25,7 +32,7 @@ class ConversationMessage:
     content: str
     
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return {"timestamp": self.timestamp, "role": self.role, "content": self.content}
     
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "ConversationMessage":
@@ -34,43 +41,49 @@ class ConversationMessage:
             role=data.get("role", "player"),
             content=data.get("content", ""),
         )
-    
-    @property
-    def time_str(self) -> str:
-        """Human-readable timestamp."""
-        return datetime.fromtimestamp(self.timestamp).strftime("%Y-%m-%d %H:%M:%S")
 
 
-@dataclass 
+@dataclass(slots=True)
 class PlayerConversation:
-    """Conversation history for a single player."""
+    """Conversation history for a single player.
+    
+    ``messages`` is a deque in chronological order; the store bounds it with
+    ``maxlen`` so the oldest messages drop off automatically.
+    """
     
     player_name: str
-    messages: list[ConversationMessage] = field(default_factory=list)
+    messages: deque[ConversationMessage] = field(default_factory=deque)
     first_interaction: float = field(default_factory=time.time)
     last_interaction: float = field(default_factory=time.time)
     total_messages: int = 0
     
-    def add_message(self, role: str, content: str) -> None:
+    def add_message(self, role: str, content: str, timestamp: float | None = None) -> ConversationMessage:
         """Add a message to the conversation."""
-        now = time.time()
-        self.messages.append(ConversationMessage(
+        now = time.time() if timestamp is None else timestamp
+        message = ConversationMessage(
             timestamp=now,
             role=role,
             content=content,
-        ))
+        )
+        self.messages.append(message)
         self.last_interaction = now
         self.total_messages += 1
+        return message
     
     def get_recent_messages(self, count: int = 10, max_age_seconds: float | None = None) -> list[ConversationMessage]:
         """Get the most recent messages, optionally filtered by age."""
-        if max_age_seconds is not None:
-            cutoff = time.time() - max_age_seconds
-            filtered = [m for m in self.messages if m.timestamp >= cutoff]
-        else:
-            filtered = self.messages
+        cutoff = time.time() - max_age_seconds if max_age_seconds is not None else None
         
-        return filtered[-count:] if count > 0 else filtered
+        # Walk newest -> oldest so only the returned tail is touched.
+        recent: list[ConversationMessage] = []
+        for m in reversed(self.messages):
+            if cutoff is not None and m.timestamp < cutoff:
+                break
+            recent.append(m)
+            if count > 0 and len(recent) >= count:
+                break
+        recent.reverse()
+        return recent
     
     def format_context(self, count: int = 10, max_age_seconds: float | None = None) -> str:
         """Format recent messages as context for LLM prompt."""
@@ -88,137 +101,366 @@ class PlayerConversation:
     def to_dict(self) -> dict[str, Any]:
         return {
             "player_name": self.player_name,
-            "messages": [m.to_dict() for m in self.messages],
+            # list() snapshots the deque in one step, so a concurrent append can't break iteration.
+            "messages": [m.to_dict() for m in list(self.messages)],
             "first_interaction": self.first_interaction,
             "last_interaction": self.last_interaction,
             "total_messages": self.total_messages,
         }
     
     @classmethod
-    def from_dict(cls, data: dict[str, Any]) -> "PlayerConversation":
+    def from_dict(cls, data: dict[str, Any], max_messages: int | None = None) -> "PlayerConversation":
         conv = cls(
             player_name=data.get("player_name", "Unknown"),
             first_interaction=float(data.get("first_interaction", time.time())),
             last_interaction=float(data.get("last_interaction", time.time())),
             total_messages=int(data.get("total_messages", 0)),
         )
-        conv.messages = [
-            ConversationMessage.from_dict(m) 
-            for m in data.get("messages", [])
-        ]
+        conv.messages = deque(
+            (ConversationMessage.from_dict(m) for m in data.get("messages", [])),
+            maxlen=max_messages,
+        )
         return conv
 
 
+@dataclass(frozen=True, slots=True)
+class ConversationView:
+    """A player's formatted recent context plus their lifetime message count."""
+    
+    context: str
+    total_messages: int
+
+
 class ConversationHistoryStore:
     """Persistent storage for player conversation histories.
     
-    Stores conversations per player in a JSON file.
+    Conversations are persisted as a JSON snapshot plus an append-only JSONL
+    log next to it (``conversations.json`` / ``conversations.jsonl``). Each new
+    message costs one appended line; the log is periodically compacted into the
+    snapshot on a debounced background timer. Call flush() to compact now.
+    Each log starts with a header naming it, and the snapshot records which
+    log it absorbed and how far, so a crash between writing the snapshot and
+    truncating the log doesn't replay those messages twice.
     Automatically prunes old messages to prevent unbounded growth.
+    
+    History is read from disk lazily, on the first read access. Until then,
+    recording a message only appends it to the log (loading replays it), so a
+    write-only store never parses the history.
     """
     
+    # Don't bother compacting logs smaller than this, however small the snapshot.
+    _MIN_COMPACT_BYTES = 64 * 1024
+    
     def __init__(
         self, 
         storage_path: Path | str | None = None,
         max_messages_per_player: int = 100,
         max_message_age_days: int = 30,
+        save_delay_seconds: float = 0.5,
+        persist: bool = True,
     ):
         """Initialize the conversation store.
         
         Args:
-            storage_path: Path to the JSON file for persistence.
+            storage_path: Path to the JSON snapshot file for persistence.
             max_messages_per_player: Maximum messages to keep per player.
             max_message_age_days: Maximum age of messages to keep.
+            save_delay_seconds: Debounce window before a requested compaction runs.
+            persist: If False, keep history in memory only and never touch disk.
         """
         if storage_path is None:
             storage_path = Path.home() / ".config" / "prefect" / "conversations.json"
         self._storage_path = Path(storage_path)
+        self._log_path = self._storage_path.with_suffix(".jsonl")
         self._max_messages = max_messages_per_player
         self._max_age_seconds = max_message_age_days * 86400
+        self._save_delay = save_delay_seconds
+        self._persist = persist
         
         self._conversations: dict[str, PlayerConversation] = {}
-        self._load()
+        # Re-entrant so _add_message can hold it across the in-memory update and
+        # the log append, keeping both consistent with a concurrent load or save.
+        self._save_lock = threading.RLock()
+        self._timer_lock = threading.Lock()
+        self._save_timer: threading.Timer | None = None
+        self._log: BinaryIO | None = None
+        # Id from the current log's header line, once known.
+        self._log_id: str | None = None
+        self._log_bytes = 0
+        self._snapshot_bytes = 0
+        self._loaded = not persist
+        # Records added before loading whose log append failed; applied by _load().
+        self._unlogged: list[dict[str, Any]] = []
+    
+    def _ensure_loaded(self) -> None:
+        """Load history from disk on first use."""
+        if self._loaded:
+            return
+        with self._save_lock:
+            if not self._loaded:
+                self._load()
+                self._loaded = True
     
     def _load(self) -> None:
-        """Load conversations from disk."""
-        if not self._storage_path.exists():
+        """Load the snapshot from disk, then replay the append-only log.
+        
+        Every change made before loading was also appended to the log, so the
+        on-disk state supersedes whatever is in memory.
+        """
+        self._conversations = {}
+        self._log_bytes = 0
+        self._log_id = None
+        # (log id, bytes) of the log already folded into the snapshot.
+        covered: tuple[str, int] | None = None
+        if self._storage_path.exists():
+            try:
+                data = _loads(self._storage_path.read_bytes())
+                
+                log_info = data.get("log") or {}
+                if log_info.get("id"):
+                    covered = (log_info["id"], int(log_info.get("offset", 0)))
+                for name, conv_data in data.get("conversations", {}).items():
+                    self._conversations[name.lower()] = PlayerConversation.from_dict(
+                        conv_data, max_messages=self._max_messages
+                    )
+                self._snapshot_bytes = self._storage_path.stat().st_size
+            except Exception as e:
+                logger.error("Failed to load conversation history: %s", e)
+        
+        if self._log_path.exists():
+            try:
+                self._replay_log(covered)
+            except Exception as e:
+                logger.error("Failed to replay conversation log: %s", e)
+        for record in self._unlogged:
+            self._apply_record(record)
+        self._unlogged.clear()
+        
+        if not self._conversations:
             logger.debug("No conversation history found at %s, starting fresh", self._storage_path)
             return
         
-        try:
-            with open(self._storage_path) as f:
-                data = json.load(f)
-            
-            for name, conv_data in data.get("conversations", {}).items():
-                self._conversations[name.lower()] = PlayerConversation.from_dict(conv_data)
-            
-            logger.info(
-                "Loaded conversation history for %d players from %s", 
-                len(self._conversations), 
-                self._storage_path
+        logger.info(
+            "Loaded conversation history for %d players from %s", 
+            len(self._conversations), 
+            self._storage_path
+        )
+    
+    def _replay_log(self, covered: tuple[str, int] | None) -> None:
+        """Apply records from the JSONL log on top of the loaded snapshot.
+        
+        Records the snapshot already covers are skipped: that happens when a
+        compaction wrote the snapshot but didn't get to truncate the log.
+        """
+        with open(self._log_path, "rb") as f:
+            for line in f:
+                start = self._log_bytes
+                self._log_bytes += len(line)
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = _loads(line)
+                except ValueError:
+                    # Most likely a torn final line from a crash mid-write.
+                    logger.warning("Skipping malformed conversation log line in %s", self._log_path)
+                    continue
+                
+                if record.get("op") == "log":
+                    self._log_id = record.get("id")
+                    continue
+                if covered is not None and self._log_id == covered[0] and start < covered[1]:
+                    continue
+                self._apply_record(record)
+    
+    def _apply_record(self, record: dict[str, Any]) -> None:
+        """Apply one log record to the in-memory conversations."""
+        player = record.get("player", "Unknown")
+        key = player.lower()
+        if record.get("op") == "clear":
+            self._conversations.pop(key, None)
+            return
+        
+        ts = float(record.get("ts", time.time()))
+        conv = self._conversations.get(key)
+        if conv is None:
+            conv = PlayerConversation(
+                player_name=player,
+                messages=deque(maxlen=self._max_messages),
+                first_interaction=ts,
+                last_interaction=ts,
             )
-        except Exception as e:
-            logger.error("Failed to load conversation history: %s", e)
+            self._conversations[key] = conv
+        conv.add_message(record.get("role", "player"), record.get("content", ""), timestamp=ts)
+        self._prune_conversation(conv)
     
-    def _save(self) -> None:
-        """Save conversations to disk."""
-        self._storage_path.parent.mkdir(parents=True, exist_ok=True)
+    def _append_record(self, record: dict[str, Any]) -> bool:
+        """Append one record to the JSONL log and compact if it grew too large.
+        
+        Returns False if the record could not be written.
+        """
+        if not self._persist:
+            return True
+        line = _dumps(record) + b"\n"
+        with self._save_lock:
+            try:
+                if self._log is None:
+                    self._log_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._log = open(self._log_path, "ab", buffering=0)
+                if os.fstat(self._log.fileno()).st_size == 0:
+                    self._log_id = uuid.uuid4().hex
+                    header = _dumps({"op": "log", "id": self._log_id}) + b"\n"
+                    self._log.write(header)
+                    self._log_bytes += len(header)
+                self._log.write(line)
+                self._log_bytes += len(line)
+            except Exception as e:
+                logger.error("Failed to append conversation history: %s", e)
+                return False
         
+        if self._log_bytes > max(4 * self._snapshot_bytes, self._MIN_COMPACT_BYTES):
+            self._schedule_save()
+        return True
+    
+    def _schedule_save(self) -> None:
+        """Schedule a compaction, coalescing with any already pending."""
+        with self._timer_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self._save_delay, self._save)
+            self._save_timer.daemon = False  # let a pending save finish at interpreter exit
+            self._save_timer.start()
+    
+    def flush(self) -> None:
+        """Compact the log into the snapshot now and close the log file."""
+        with self._timer_lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer is not None:
+            timer.cancel()
+        if self._log_bytes or timer is not None:
+            self._save()
+        with self._save_lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+    
+    def _save(self) -> None:
+        """Write a snapshot atomically (temp file + rename) and truncate the log."""
+        if not self._persist:
+            return
+        self._ensure_loaded()
+        with self._save_lock:
+            self._storage_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            data = {
+                "version": 1,
+                "updated_at": time.time(),
+                "log": {"id": self._log_id, "offset": self._log_bytes},
+                "conversations": {
+                    name: conv.to_dict()
+                    for name, conv in list(self._conversations.items())
+                },
+            }
+            
+            try:
+                fd, tmp_name = tempfile.mkstemp(
+                    dir=self._storage_path.parent,
+                    prefix=f".{self._storage_path.name}.",
+                    suffix=".tmp",
+                )
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(_dumps(data))
+                    os.replace(tmp_name, self._storage_path)
+                except BaseException:
+                    os.unlink(tmp_name)
+                    raise
+                
+                # Everything in the log is now part of the snapshot. Should this
+                # truncation not happen, the "log" entry above stops a replay.
+                if self._log is not None:
+                    self._log.truncate(0)
+                elif self._log_path.exists():
+                    self._log_path.write_bytes(b"")
+                self._log_bytes = 0
+                self._log_id = None
+                self._snapshot_bytes = self._storage_path.stat().st_size
+                logger.debug(
+                    "Saved conversation history for %d players to %s", 
+                    len(self._conversations), 
+                    self._storage_path
+                )
+            except Exception as e:
+                logger.error("Failed to save conversation history: %s", e)
+    
+    def export(self, path: Path | str, *, indent: int = 2) -> None:
+        """Write a human-readable (indented) copy of all conversations, for debugging."""
+        self._ensure_loaded()
         data = {
             "version": 1,
-            "updated_at": datetime.now().isoformat(),
             "conversations": {
                 name: conv.to_dict()
-                for name, conv in self._conversations.items()
+                for name, conv in list(self._conversations.items())
             },
         }
-        
-        try:
-            with open(self._storage_path, "w") as f:
-                json.dump(data, f, indent=2)
-            logger.debug(
-                "Saved conversation history for %d players to %s", 
-                len(self._conversations), 
-                self._storage_path
-            )
-        except Exception as e:
-            logger.error("Failed to save conversation history: %s", e)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(data, indent=indent))
     
     def _prune_conversation(self, conv: PlayerConversation) -> None:
-        """Remove old messages and limit total count."""
-        now = time.time()
-        cutoff = now - self._max_age_seconds
-        
-        # Filter out messages older than max age
-        conv.messages = [m for m in conv.messages if m.timestamp >= cutoff]
+        """Remove messages older than the max age.
         
-        # Keep only the most recent max_messages
-        if len(conv.messages) > self._max_messages:
-            conv.messages = conv.messages[-self._max_messages:]
+        The count limit is enforced by the deque's maxlen; since messages are
+        chronological, expired ones are only ever at the left end.
+        """
+        cutoff = time.time() - self._max_age_seconds
+        messages = conv.messages
+        while messages and messages[0].timestamp < cutoff:
+            messages.popleft()
     
     def get_conversation(self, player_name: str) -> PlayerConversation:
         """Get or create a conversation for a player."""
+        self._ensure_loaded()
+        return self._get_or_create(player_name)
+    
+    def _get_or_create(self, player_name: str) -> PlayerConversation:
         key = player_name.lower()
         
         if key not in self._conversations:
-            self._conversations[key] = PlayerConversation(player_name=player_name)
+            self._conversations[key] = PlayerConversation(
+                player_name=player_name,
+                messages=deque(maxlen=self._max_messages),
+            )
         
         return self._conversations[key]
     
-    def add_player_message(self, player_name: str, content: str) -> PlayerConversation:
+    def _add_message(self, player_name: str, role: str, content: str) -> ConversationMessage:
+        with self._save_lock:
+            if not self._loaded:
+                # The log is the only copy until loading replays it.
+                message = ConversationMessage(timestamp=time.time(), role=role, content=content)
+                record = {"player": player_name, "role": role, "ts": message.timestamp, "content": content}
+                if not self._append_record(record):
+                    self._unlogged.append(record)
+                return message
+            
+            conv = self._get_or_create(player_name)
+            message = conv.add_message(role, content)
+            self._prune_conversation(conv)
+            self._append_record({
+                "player": conv.player_name,
+                "role": role,
+                "ts": message.timestamp,
+                "content": content,
+            })
+        return message
+    
+    def add_player_message(self, player_name: str, content: str) -> ConversationMessage:
         """Record a message from a player."""
-        conv = self.get_conversation(player_name)
-        conv.add_message("player", content)
-        self._prune_conversation(conv)
-        self._save()
-        return conv
+        return self._add_message(player_name, "player", content)
     
-    def add_prefect_response(self, player_name: str, content: str) -> PlayerConversation:
+    def add_prefect_response(self, player_name: str, content: str) -> ConversationMessage:
         """Record a response from Prefect."""
-        conv = self.get_conversation(player_name)
-        conv.add_message("prefect", content)
-        self._prune_conversation(conv)
-        self._save()
-        return conv
+        return self._add_message(player_name, "prefect", content)
     
     def get_context_for_player(
         self, 
@@ -240,6 +482,22 @@ class ConversationHistoryStore:
         conv = self.get_conversation(player_name)
         return conv.format_context(count=recent_count, max_age_seconds=session_ttl_seconds)
     
+    def get_view(
+        self,
+        player_name: str,
+        recent_count: int = 10,
+        session_ttl_seconds: float | None = None,
+    ) -> ConversationView:
+        """Get what a chat reply needs from a player's history in one lookup.
+        
+        ``context`` matches get_context_for_player() with the same arguments.
+        """
+        conv = self.get_conversation(player_name)
+        return ConversationView(
+            context=conv.format_context(count=recent_count, max_age_seconds=session_ttl_seconds),
+            total_messages=conv.total_messages,
+        )
+    
     def get_player_summary(self, player_name: str) -> dict[str, Any]:
         """Get a summary of interactions with a player."""
         conv = self.get_conversation(player_name)
@@ -254,13 +512,15 @@ class ConversationHistoryStore:
     
     def get_all_players(self) -> list[str]:
         """Get list of all players with conversation history."""
+        self._ensure_loaded()
         return [conv.player_name for conv in self._conversations.values()]
     
     def clear_player_history(self, player_name: str) -> bool:
         """Clear conversation history for a player."""
+        self._ensure_loaded()
         key = player_name.lower()
         if key in self._conversations:
             del self._conversations[key]
-            self._save()
+            self._append_record({"player": player_name, "op": "clear"})
             return True
         return False
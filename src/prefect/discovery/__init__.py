@@ -5,7 +5,12 @@ via paginated help parsing, with robust heuristics that don't assume format stab
 """
 from __future__ import annotations
 
-from prefect.discovery.parser import normalize_output, parse_command_line, extract_commands_from_page
+from prefect.discovery.parser import (
+    normalize_output,
+    parse_command_line,
+    extract_commands_from_page,
+    extract_commands_from_normalized,
+)
 from prefect.discovery.registry import CommandEntry, CommandRegistry, DiscoverySnapshot
 from prefect.discovery.discoverer import CommandDiscoverer
 from prefect.discovery.bootstrap import AllowlistBootstrapper, AllowlistEntry, GeneratedAllowlist
@@ -14,6 +19,7 @@ __all__ = [
     "normalize_output",
     "parse_command_line",
     "extract_commands_from_page",
+    "extract_commands_from_normalized",
     "CommandEntry",
     "CommandRegistry",
     "DiscoverySnapshot",
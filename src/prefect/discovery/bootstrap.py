@@ -5,76 +5,111 @@ If Prefect is uncertain, it denies.
 """
 from __future__ import annotations
 
-import json
+import functools
 import logging
+import operator
 import re
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from prefect import json_codec
 from prefect.discovery.registry import CommandRegistry, DiscoverySnapshot
 
 logger = logging.getLogger(__name__)
 
+_by_command = operator.attrgetter("command")
+
 
 # === Safety Classification Patterns ===
 
+# Name rules are plain set/suffix lookups on the lowercased name; description
+# rules are one fused, case-insensitive pattern per category.
+
 # Category A: Always allow (read-only / informational)
-# Commands that match these patterns are considered safe
-_SAFE_NAME_PATTERNS = [
-    re.compile(r"^help$", re.IGNORECASE),
-    re.compile(r"^version$", re.IGNORECASE),
-    re.compile(r"^\?$"),
-    re.compile(r".*list$", re.IGNORECASE),  # playerlist, whitelist (read), etc.
-    re.compile(r".*status$", re.IGNORECASE),
-    re.compile(r".*info$", re.IGNORECASE),
-    re.compile(r"^players?$", re.IGNORECASE),
-    re.compile(r"^online$", re.IGNORECASE),
-    re.compile(r"^uptime$", re.IGNORECASE),
-    re.compile(r"^time$", re.IGNORECASE),  # Get world time
-    re.compile(r"^seed$", re.IGNORECASE),  # Read-only seed display
-    re.compile(r"^tps$", re.IGNORECASE),  # Server performance
-    re.compile(r"^ping$", re.IGNORECASE),
-    re.compile(r"^motd$", re.IGNORECASE),  # Read MOTD
-]
+# Commands with these names are considered safe
+_SAFE_NAMES = frozenset({
+    "help",
+    "version",
+    "?",
+    "player",
+    "players",
+    "online",
+    "uptime",
+    "time",  # Get world time
+    "seed",  # Read-only seed display
+    "tps",  # Server performance
+    "ping",
+    "motd",  # Read MOTD
+})
+_SAFE_NAME_SUFFIXES = ("list", "status", "info")  # playerlist, whitelist (read), etc.
 
-# Description patterns that suggest read-only behavior
-_SAFE_DESC_PATTERNS = [
-    re.compile(r"\b(show|list|display|view|print|get)\b", re.IGNORECASE),
-    re.compile(r"\b(information|status|info)\b", re.IGNORECASE),
-]
+# Description words that suggest read-only behavior
+_SAFE_DESC_RE = re.compile(
+    r"\b(?:show|list|display|view|print|get|information|status|info)\b",
+    re.IGNORECASE,
+)
 
 # Category B: Allow with restrictions (messaging)
-_MESSAGING_PATTERNS = [
-    re.compile(r"^say$", re.IGNORECASE),
-    re.compile(r"^announce$", re.IGNORECASE),
-    re.compile(r"^broadcast$", re.IGNORECASE),
-    re.compile(r"^msg$", re.IGNORECASE),
-    re.compile(r"^tell$", re.IGNORECASE),
-    re.compile(r"^whisper$", re.IGNORECASE),
-]
+_MESSAGING_NAMES = frozenset({"say", "announce", "broadcast", "msg", "tell", "whisper"})
 
 # Category C: Deny by default (dangerous commands)
-# These patterns explicitly mark commands as dangerous even if they seem safe
-_DANGEROUS_PATTERNS = [
-    re.compile(r"\b(kick|ban|unban|pardon)\b", re.IGNORECASE),
-    re.compile(r"\b(op|deop|admin)\b", re.IGNORECASE),
-    re.compile(r"\b(save|load|backup|restore)\b", re.IGNORECASE),
-    re.compile(r"\b(stop|shutdown|restart|reload)\b", re.IGNORECASE),
-    re.compile(r"\b(give|spawn|summon|create)\b", re.IGNORECASE),
-    re.compile(r"\b(tp|teleport|warp)\b", re.IGNORECASE),
-    re.compile(r"\b(kill|damage|heal)\b", re.IGNORECASE),
-    re.compile(r"\b(set|config|configure|edit)\b", re.IGNORECASE),
-    re.compile(r"\b(add|remove|delete|clear)\b", re.IGNORECASE),
-    re.compile(r"\b(cheat|god|fly|noclip)\b", re.IGNORECASE),
-    re.compile(r"\b(world|gen|generate)\b", re.IGNORECASE),
-    re.compile(r"\b(whitelist|blacklist)\b.*\b(add|remove)\b", re.IGNORECASE),
-    re.compile(r"\bexec(ute)?\b", re.IGNORECASE),
-]
+# This pattern explicitly marks commands as dangerous even if they seem safe
+_DANGEROUS_RE = re.compile(
+    r"\b(?:"
+    r"kick|ban|unban|pardon"
+    r"|op|deop|admin"
+    r"|save|load|backup|restore"
+    r"|stop|shutdown|restart|reload"
+    r"|give|spawn|summon|create"
+    r"|tp|teleport|warp"
+    r"|kill|damage|heal"
+    r"|set|config|configure|edit"
+    r"|add|remove|delete|clear"
+    r"|cheat|god|fly|noclip"
+    r"|world|gen|generate"
+    r"|exec(?:ute)?"
+    r")\b"
+    r"|\b(?:whitelist|blacklist)\b.*\b(?:add|remove)\b",
+    re.IGNORECASE,
+)
 
 
-@dataclass
+@functools.lru_cache(maxsize=4096)
+def _classify_cached(name_lower: str, description: str) -> tuple[str, str]:
+    """Classify a command into category and reason.
+    
+    Pure function of its arguments, so results are memoized: paginated help
+    output repeats many commands.
+    
+    Returns:
+        Tuple of (category, reason) where category is one of:
+        - "safe": Read-only/informational
+        - "messaging": Say/announce with restrictions
+        - "dangerous": Deny by default
+    """
+    # First check if explicitly dangerous
+    if _DANGEROUS_RE.search(name_lower) or _DANGEROUS_RE.search(description):
+        return "dangerous", "matches_dangerous_pattern"
+    
+    # Check if messaging command
+    if name_lower in _MESSAGING_NAMES:
+        return "messaging", "messaging_command"
+    
+    # Check if safe by name
+    if name_lower in _SAFE_NAMES or name_lower.endswith(_SAFE_NAME_SUFFIXES):
+        return "safe", "safe_name_pattern"
+    
+    # Check if safe by description
+    if _SAFE_DESC_RE.search(description):
+        return "safe", "safe_description"
+    
+    # Default to dangerous (default-deny)
+    return "dangerous", "unknown_unclassified"
+
+
+@dataclass(frozen=True, slots=True)
 class AllowlistEntry:
     """A single allowlist entry with constraints."""
     command: str  # Normalized command key
@@ -100,7 +135,7 @@ class AllowlistEntry:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class DeniedEntry:
     """A denied command with reason."""
     command: str
@@ -110,15 +145,24 @@ class DeniedEntry:
         return {"command": self.command, "reason": self.reason}
 
 
-@dataclass
+@dataclass(slots=True)
 class GeneratedAllowlist:
     """A complete generated allowlist."""
     generated_at: str
     mode: str = "default_deny"
     source_snapshot: str = ""
-    allowed: list[AllowlistEntry] = field(default_factory=list)
+    # Stored as a tuple; assigning a new sequence resets the lookup index.
+    allowed: tuple[AllowlistEntry, ...] = ()
     denied: list[DeniedEntry] = field(default_factory=list)
     sanitization: dict[str, Any] = field(default_factory=dict)
+    # Lookup index for is_allowed(), built on first use.
+    _index: dict[str, AllowlistEntry] | None = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "allowed":
+            value = tuple(value)
+            object.__setattr__(self, "_index", None)
+        object.__setattr__(self, name, value)
     
     def __post_init__(self):
         if not self.sanitization:
@@ -151,15 +195,12 @@ class GeneratedAllowlist:
     def save(self, path: Path) -> None:
         """Save allowlist to JSON file."""
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        path.write_bytes(json_codec.dumps(self.to_dict(), indent=True))
     
     @classmethod
     def load(cls, path: Path) -> GeneratedAllowlist:
         """Load allowlist from JSON file."""
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return cls.from_dict(data)
+        return cls.from_dict(json_codec.loads(path.read_bytes()))
     
     def get_allowed_commands(self) -> set[str]:
         """Get set of allowed command keys."""
@@ -167,11 +208,10 @@ class GeneratedAllowlist:
     
     def is_allowed(self, command_key: str) -> AllowlistEntry | None:
         """Check if command is allowed, return entry if so."""
-        key = command_key.lstrip("/!").lower()
-        for entry in self.allowed:
-            if entry.command == key:
-                return entry
-        return None
+        if self._index is None:
+            # Reversed so the first entry wins if a command is listed twice.
+            self._index = {e.command: e for e in reversed(self.allowed)}
+        return self._index.get(command_key.lstrip("/!").lower())
     
     def to_markdown(self) -> str:
         """Generate markdown report of allowlist."""
@@ -188,8 +228,10 @@ class GeneratedAllowlist:
             "|---------|------------|------------|--------|",
         ]
         
-        for entry in sorted(self.allowed, key=lambda e: e.command):
-            lines.append(f"| `{entry.command}` | {entry.max_len} | {entry.arg_policy} | {entry.reason} |")
+        lines.extend(
+            f"| `{e.command}` | {e.max_len} | {e.arg_policy} | {e.reason} |"
+            for e in sorted(self.allowed, key=_by_command)
+        )
         
         lines.extend([
             "",
@@ -199,8 +241,7 @@ class GeneratedAllowlist:
             "|---------|--------|",
         ])
         
-        for entry in sorted(self.denied, key=lambda e: e.command):
-            lines.append(f"| `{entry.command}` | {entry.reason} |")
+        lines.extend(f"| `{e.command}` | {e.reason} |" for e in sorted(self.denied, key=_by_command))
         
         lines.extend([
             "",
@@ -226,38 +267,6 @@ class AllowlistBootstrapper:
         self._safe_max_len = safe_command_max_len
         self._messaging_max_len = messaging_max_len
     
-    def _classify_command(self, key: str, name: str, description: str) -> tuple[str, str]:
-        """Classify a command into category and reason.
-        
-        Returns:
-            Tuple of (category, reason) where category is one of:
-            - "safe": Read-only/informational
-            - "messaging": Say/announce with restrictions
-            - "dangerous": Deny by default
-        """
-        # First check if explicitly dangerous
-        for pattern in _DANGEROUS_PATTERNS:
-            if pattern.search(name) or pattern.search(description):
-                return "dangerous", "matches_dangerous_pattern"
-        
-        # Check if messaging command
-        for pattern in _MESSAGING_PATTERNS:
-            if pattern.match(name):
-                return "messaging", "messaging_command"
-        
-        # Check if safe by name
-        for pattern in _SAFE_NAME_PATTERNS:
-            if pattern.match(name):
-                return "safe", "safe_name_pattern"
-        
-        # Check if safe by description
-        for pattern in _SAFE_DESC_PATTERNS:
-            if pattern.search(description):
-                return "safe", "safe_description"
-        
-        # Default to dangerous (default-deny)
-        return "dangerous", "unknown_unclassified"
-    
     def bootstrap(
         self,
         snapshot: DiscoverySnapshot,
@@ -272,43 +281,49 @@ class AllowlistBootstrapper:
         Returns:
             GeneratedAllowlist ready to save or use.
         """
-        now = datetime.now(timezone.utc).astimezone()
         allowlist = GeneratedAllowlist(
-            generated_at=now.isoformat(),
+            generated_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
             source_snapshot=snapshot_path,
         )
         
+        allowed: list[AllowlistEntry] = []
+        denied: list[DeniedEntry] = []
+        # Per-command logging is checked once rather than inside every logger call.
+        log_each = logger.isEnabledFor(logging.INFO)
+        
         for entry in snapshot.commands:
-            category, reason = self._classify_command(
-                entry.key,
-                entry.name,
-                entry.description,
-            )
+            category, reason = _classify_cached(entry.name.lower(), entry.description)
             
             if category == "safe":
-                allowlist.allowed.append(AllowlistEntry(
+                allowed.append(AllowlistEntry(
                     command=entry.key,
                     max_len=self._safe_max_len,
                     arg_policy="any",
                     reason=reason,
                 ))
-                logger.info("Allowlist: ALLOW '%s' (%s)", entry.key, reason)
+                if log_each:
+                    logger.info("Allowlist: ALLOW '%s' (%s)", entry.key, reason)
                 
             elif category == "messaging":
-                allowlist.allowed.append(AllowlistEntry(
+                allowed.append(AllowlistEntry(
                     command=entry.key,
                     max_len=self._messaging_max_len,
                     arg_policy="message",
                     reason=reason,
                 ))
-                logger.info("Allowlist: ALLOW '%s' with message restrictions (%s)", entry.key, reason)
+                if log_each:
+                    logger.info("Allowlist: ALLOW '%s' with message restrictions (%s)", entry.key, reason)
                 
             else:  # dangerous
-                allowlist.denied.append(DeniedEntry(
+                denied.append(DeniedEntry(
                     command=entry.key,
                     reason=reason,
                 ))
-                logger.info("Allowlist: DENY '%s' (%s)", entry.key, reason)
+                if log_each:
+                    logger.info("Allowlist: DENY '%s' (%s)", entry.key, reason)
+        
+        allowlist.allowed = allowed
+        allowlist.denied = denied
         
         logger.info(
             "Allowlist bootstrap complete: %d allowed, %d denied",
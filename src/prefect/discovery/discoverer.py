@@ -11,7 +11,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable
 
-from prefect.discovery.parser import normalize_output, extract_commands_from_page
+from prefect.discovery.parser import normalize_output, extract_commands_from_normalized
 from prefect.discovery.registry import (
     CommandEntry,
     CommandRegistry,
@@ -23,7 +23,7 @@ from prefect.discovery.registry import (
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConsoleResult:
     """Result from executing a console command."""
     stdout: str
@@ -47,6 +47,7 @@ class CommandDiscoverer:
         help_cmd: str = "help",
         help_page_template: str = "help {page}",
         inter_page_delay: float = 0.5,
+        min_inter_page_delay: float = 0.05,
     ):
         """Initialize discoverer.
         
@@ -57,7 +58,9 @@ class CommandDiscoverer:
             page_stable_limit: Stop after this many consecutive pages with no new commands.
             help_cmd: Command for first help page.
             help_page_template: Template for subsequent pages (use {page}).
-            inter_page_delay: Seconds to wait between page requests.
+            inter_page_delay: Maximum seconds to wait between page requests.
+            min_inter_page_delay: Minimum wait; the actual delay tracks half the
+                previous page's response time within these bounds.
         """
         self._run_command = run_command
         self._server_root = server_root
@@ -66,20 +69,44 @@ class CommandDiscoverer:
         self._help_cmd = help_cmd
         self._help_page_template = help_page_template
         self._inter_page_delay = inter_page_delay
+        self._min_inter_page_delay = min_inter_page_delay
     
-    def _compute_hash(self, text: str) -> str:
-        """Compute hash of normalized text for loop detection."""
-        normalized = normalize_output(text).strip()
-        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+    def _page_delay(self, last_latency: float) -> float:
+        """Delay before the next page: fast responses mean the server isn't busy."""
+        return min(self._inter_page_delay, max(self._min_inter_page_delay, last_latency * 0.5))
     
-    def _is_empty_output(self, text: str) -> bool:
-        """Check if output is effectively empty."""
-        normalized = normalize_output(text).strip()
-        if not normalized:
-            return True
-        # Also treat single-line noise as empty
-        lines = [l for l in normalized.split("\n") if l.strip()]
-        return len(lines) == 0
+    def _compute_hash(self, normalized: str) -> str:
+        """Compute hash of normalize_output() text for loop detection.
+        
+        Fed line by line so a large page is never encoded into one big bytes
+        object; the digest equals hashing the whole stripped page at once.
+        """
+        h = hashlib.blake2b(digest_size=8)
+        update = h.update
+        lines = normalized.strip().split("\n")
+        update(lines[0].encode("utf-8"))
+        for line in lines[1:]:
+            update(b"\n")
+            update(line.encode("utf-8"))
+        return h.hexdigest()
+    
+    def _is_empty_output(self, normalized: str) -> bool:
+        """Check if normalize_output() text is effectively empty."""
+        return not normalized.strip()
+    
+    def _register_commands(self, registry: CommandRegistry, normalized: str, page: int) -> int:
+        """Parse a normalized help page into registry; return how many commands were new."""
+        from_parsed = CommandEntry.from_parsed
+        add = registry.add
+        debug_on = logger.isEnabledFor(logging.DEBUG)
+        new_count = 0
+        for parsed, page_num in extract_commands_from_normalized(normalized, page_number=page):
+            entry = from_parsed(parsed, page_num)
+            if add(entry):
+                new_count += 1
+                if debug_on:
+                    logger.debug("Discovery: found command '%s' on page %d", entry.key, page)
+        return new_count
     
     def discover(self) -> DiscoverySnapshot:
         """Run discovery and return a complete snapshot.
@@ -97,7 +124,9 @@ class CommandDiscoverer:
         
         # Page 1
         logger.info("Discovery: fetching help page 1")
+        t0 = time.monotonic()
         result = self._run_command(self._help_cmd)
+        last_latency = time.monotonic() - t0
         
         if not result.exit_ok:
             metadata.termination_reason = "help_command_failed"
@@ -105,24 +134,19 @@ class CommandDiscoverer:
             logger.error("Discovery: help command failed")
             return snapshot
         
-        page1_hash = self._compute_hash(result.stdout)
+        normalized = normalize_output(result.stdout)
+        page1_hash = self._compute_hash(normalized)
         seen_hashes.add(page1_hash)
         metadata.page_hashes[1] = page1_hash
         metadata.pages_attempted = 1
         
-        if self._is_empty_output(result.stdout):
+        if self._is_empty_output(normalized):
             metadata.termination_reason = "empty_help_output"
             logger.warning("Discovery: help returned empty output")
             return snapshot
         
         # Extract commands from page 1
-        entries = extract_commands_from_page(result.stdout, page_number=1)
-        new_count = 0
-        for parsed, page_num in entries:
-            entry = CommandEntry.from_parsed(parsed, page_num)
-            if registry.add(entry):
-                new_count += 1
-                logger.debug("Discovery: found command '%s' on page 1", entry.key)
+        new_count = self._register_commands(registry, normalized, 1)
         
         metadata.pages_captured = 1
         
@@ -135,12 +159,14 @@ class CommandDiscoverer:
         
         # Iterate subsequent pages
         for page in range(2, self._max_help_pages + 1):
-            time.sleep(self._inter_page_delay)
+            time.sleep(self._page_delay(last_latency))
             
             cmd = self._help_page_template.format(page=page)
             logger.info("Discovery: fetching help page %d via '%s'", page, cmd)
             
+            t0 = time.monotonic()
             result = self._run_command(cmd)
+            last_latency = time.monotonic() - t0
             metadata.pages_attempted = page
             
             if not result.exit_ok:
@@ -148,14 +174,17 @@ class CommandDiscoverer:
                 logger.warning("Discovery: page %d command failed, stopping", page)
                 break
             
+            # Normalize once; the emptiness check, hash and parser all share it
+            normalized = normalize_output(result.stdout)
+            
             # Check for empty output
-            if self._is_empty_output(result.stdout):
+            if self._is_empty_output(normalized):
                 termination_reason = "empty_page_output"
                 logger.info("Discovery: page %d returned empty output, stopping", page)
                 break
             
             # Check for hash loop (pagination cycling back)
-            page_hash = self._compute_hash(result.stdout)
+            page_hash = self._compute_hash(normalized)
             if page_hash in seen_hashes:
                 termination_reason = "pagination_loop_detected"
                 logger.info("Discovery: page %d hash matches previous page, stopping", page)
@@ -166,13 +195,7 @@ class CommandDiscoverer:
             metadata.pages_captured = page
             
             # Extract commands
-            entries = extract_commands_from_page(result.stdout, page_number=page)
-            new_count = 0
-            for parsed, page_num in entries:
-                entry = CommandEntry.from_parsed(parsed, page_num)
-                if registry.add(entry):
-                    new_count += 1
-                    logger.debug("Discovery: found command '%s' on page %d", entry.key, page)
+            new_count = self._register_commands(registry, normalized, page)
             
             logger.info("Discovery: page %d yielded %d new commands (total: %d)", page, new_count, len(registry))
             
@@ -6,48 +6,55 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
+from typing import Iterator
 
 
-# ANSI escape sequence pattern (including partial codes without \x1b prefix)
-_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]|\x1b\][^\x07]*\x07|\x1b[()][AB012]")
-# Also match bare [NNm] patterns that may appear without escape prefix
-_ANSI_BARE = re.compile(r"\[\d+m")
+# ANSI escape sequences, plus bare [NNm] codes that may appear without the \x1b prefix
+_ANSI_FUSED = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]|\x1b\][^\x07]*\x07|\x1b[()][AB012]|\[\d+m")
 
 # Timestamp pattern: [YYYY-MM-DD HH:MM:SS] or similar
 _TIMESTAMP = re.compile(r"^\s*\[\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\]\s*")
 
-# Patterns for identifying command lines (conservative heuristics)
-# Pattern 1: Starts with / or ! (chat-style commands)
-_RE_CHAT_STYLE = re.compile(r"^[/!]([a-zA-Z][a-zA-Z0-9_-]*)")
-
-# Pattern 2: Starts with alphanumeric token followed by space, dash, colon, or end
-_RE_SIMPLE_CMD = re.compile(r"^([a-zA-Z][a-zA-Z0-9_-]*)\s*(?:[-:\s]|$)")
-
-# Pattern 3: Contains token followed by angle brackets or square brackets (syntax hints)
-_RE_WITH_ARGS = re.compile(r"^([a-zA-Z][a-zA-Z0-9_-]*)\s*[<\[]")
-
-# Pattern 4: Line that looks like "command - description" or "command: description"
-_RE_CMD_DESC = re.compile(r"^([a-zA-Z][a-zA-Z0-9_-]*)\s*[-:]\s*\S")
-
-# Noise patterns - lines to skip
-_NOISE_PATTERNS = [
-    re.compile(r"^-+$"),  # Separator lines
-    re.compile(r"^=+$"),
-    re.compile(r"^\s*$"),  # Empty lines
-    re.compile(r"^page\s+\d+", re.IGNORECASE),  # Page indicators
-    re.compile(r"^\d+\s*(/|of)\s*\d+", re.IGNORECASE),  # Page numbers like "1/5" or "1 of 5"
-    re.compile(r"^type\s+.*(help|more)", re.IGNORECASE),  # "Type help for more"
-    re.compile(r"^available\s+commands", re.IGNORECASE),  # Headers
-    re.compile(r"^commands?\s*(page)?\s*\d*", re.IGNORECASE),  # "Commands page 1 of 16"
-    re.compile(r"^server\s+commands", re.IGNORECASE),
-    re.compile(r"^>\s"),  # Command echo like "> help"
-    # Server log messages that slip through timestamps
-    # Match "Suggesting garbage collection..." pattern (capitalized word + action + ellipsis)
-    re.compile(r"^[A-Z][a-z]+ing\s+.*\.\.\.$"),
-]
-
-
-@dataclass
+# Pattern for identifying command lines (conservative heuristics). The
+# alternatives are tried in order, so the first that fits decides the name:
+#   1. Starts with / or ! (chat-style commands)
+#   2. Alphanumeric token followed by space, dash, colon, or end
+#   3. Token followed by angle brackets or square brackets (syntax hints)
+# ("command - description" / "command: description" lines are covered by 2.)
+_RE_CMDLINE = re.compile(
+    r"^(?:(?P<chat>[/!][a-zA-Z][a-zA-Z0-9_-]*)"
+    r"|(?P<simple>[a-zA-Z][a-zA-Z0-9_-]*)\s*(?:[-:\s]|$)"
+    r"|(?P<with_args>[a-zA-Z][a-zA-Z0-9_-]*)\s*[<\[])"
+)
+
+# Whole lines of a normalized page that could hold a command: optional indent and
+# timestamp, then a command-looking start. Everything else is rejected by
+# parse_command_line anyway, so only these lines are handed to it.
+_RE_CANDIDATE_LINE = re.compile(
+    r"^[^\S\n]*(?:\[\d{4}-\d{2}-\d{2}[^\S\n]+\d{2}:\d{2}:\d{2}\][^\S\n]*)?[/!]?[a-zA-Z][^\n]*",
+    re.MULTILINE,
+)
+
+# Description separator within the remainder: "<syntax> - description" or "<syntax>: description"
+_RE_DESC_SEP = re.compile(r"\s+[-:]\s+(.+)$")
+
+# Noise patterns - lines to skip. Separators ("-----", "=====") and command
+# echoes ("> help") are recognised without regex in is_noise_line; the rest are
+# keyed by (lowercased) first character so each line tries at most two patterns.
+_RE_PAGE_NUM = re.compile(r"^\d+\s*(/|of)\s*\d+", re.IGNORECASE)  # Page numbers like "1/5" or "1 of 5"
+_NOISE_BY_FIRST_CHAR = {
+    "p": re.compile(r"^page\s+\d+", re.IGNORECASE),  # Page indicators
+    "t": re.compile(r"^type\s+.*(help|more)", re.IGNORECASE),  # "Type help for more"
+    "a": re.compile(r"^available\s+commands", re.IGNORECASE),  # Headers
+    "c": re.compile(r"^commands?\s*(page)?\s*\d*", re.IGNORECASE),  # "Commands page 1 of 16"
+    "s": re.compile(r"^server\s+commands", re.IGNORECASE),
+}
+# Server log messages that slip through timestamps
+# Match "Suggesting garbage collection..." pattern (capitalized word + action + ellipsis)
+_RE_LOG_ELLIPSIS = re.compile(r"^[A-Z][a-z]+ing\s+.*\.\.\.$")
+
+
+@dataclass(slots=True)
 class ParsedCommand:
     """A command parsed from a help line."""
     name: str
@@ -62,10 +69,8 @@ class ParsedCommand:
 
 
 def strip_ansi(text: str) -> str:
-    """Remove ANSI escape sequences from text."""
-    text = _ANSI_ESCAPE.sub("", text)
-    text = _ANSI_BARE.sub("", text)  # Also strip bare [39m] style codes
-    return text
+    """Remove ANSI escape sequences (and bare [39m] style codes) from text."""
+    return _ANSI_FUSED.sub("", text)
 
 
 def strip_timestamp(text: str) -> str:
@@ -81,10 +86,9 @@ def normalize_output(text: str) -> str:
     - Strip trailing whitespace per line
     - Preserve original spacing within lines (for raw storage)
     """
-    text = strip_ansi(text)
+    text = _ANSI_FUSED.sub("", text)
     text = text.replace("\r\n", "\n").replace("\r", "\n")
-    lines = [line.rstrip() for line in text.split("\n")]
-    return "\n".join(lines)
+    return "\n".join(line.rstrip() for line in text.split("\n"))
 
 
 def normalize_line_for_parsing(line: str) -> str:
@@ -104,55 +108,43 @@ def is_noise_line(line: str) -> bool:
     stripped = line.strip()
     if not stripped:
         return True
-    for pattern in _NOISE_PATTERNS:
-        if pattern.match(stripped):
-            return True
-    return False
+    
+    c0 = stripped[0]
+    if c0 == "-" or c0 == "=":
+        return not stripped.strip(c0)  # Separator lines
+    if c0 == ">":
+        return stripped[1:2].isspace()  # Command echo like "> help"
+    if c0.isdigit():
+        return _RE_PAGE_NUM.match(stripped) is not None
+    
+    pattern = _NOISE_BY_FIRST_CHAR.get(c0.lower())
+    if pattern is not None and pattern.match(stripped):
+        return True
+    return "A" <= c0 <= "Z" and _RE_LOG_ELLIPSIS.match(stripped) is not None
 
 
-def parse_command_line(line: str) -> ParsedCommand | None:
+def parse_command_line(line: str, *, already_ansi_stripped: bool = False) -> ParsedCommand | None:
     """Parse a single line to extract command information.
     
     Returns None if the line doesn't appear to be a command entry.
     Uses conservative heuristics - better to miss some than to hallucinate.
+    Pass already_ansi_stripped=True for lines that came out of normalize_output().
     """
     raw_line = line  # Preserve original for storage
     
     # Fully normalize for parsing (strip ANSI, timestamp, whitespace)
-    stripped = normalize_line_for_parsing(line)
+    if already_ansi_stripped:
+        stripped = strip_timestamp(line).strip()
+    else:
+        stripped = normalize_line_for_parsing(line)
     if not stripped or is_noise_line(stripped):
         return None
     
-    name: str | None = None
-    syntax: str = ""
-    description: str = ""
-    
-    # Try chat-style first (/command or !command)
-    m = _RE_CHAT_STYLE.match(stripped)
-    if m:
-        name = stripped[0] + m.group(1)  # Keep the / or !
-        remainder = stripped[len(name):].strip()
-    else:
-        # Try simple command pattern
-        m = _RE_SIMPLE_CMD.match(stripped)
-        if m:
-            name = m.group(1)
-            remainder = stripped[len(name):].strip()
-        else:
-            # Try pattern with args
-            m = _RE_WITH_ARGS.match(stripped)
-            if m:
-                name = m.group(1)
-                remainder = stripped[len(name):].strip()
-            else:
-                # Try command-description pattern
-                m = _RE_CMD_DESC.match(stripped)
-                if m:
-                    name = m.group(1)
-                    remainder = stripped[len(name):].strip()
-    
-    if not name:
+    m = _RE_CMDLINE.match(stripped)
+    if m is None:
         return None
+    name = m.group(m.lastgroup)
+    remainder = stripped[len(name):].strip()
     
     # Validate name looks reasonable
     if len(name.lstrip("/!")) < 2 or len(name) > 32:
@@ -168,7 +160,7 @@ def parse_command_line(line: str) -> ParsedCommand | None:
     remainder = remainder.lstrip("-: ")
     
     # Look for description separator
-    desc_match = re.search(r"\s+[-:]\s+(.+)$", remainder)
+    desc_match = _RE_DESC_SEP.search(remainder)
     if desc_match:
         description = desc_match.group(1).strip()
         syntax_part = remainder[:desc_match.start()].strip()
@@ -195,13 +187,15 @@ def extract_commands_from_page(page_text: str, page_number: int = 1) -> list[tup
     
     Returns list of (ParsedCommand, page_number) tuples.
     """
-    results: list[tuple[ParsedCommand, int]] = []
-    
-    normalized = normalize_output(page_text)
+    return list(extract_commands_from_normalized(normalize_output(page_text), page_number))
+
+
+def extract_commands_from_normalized(normalized: str, page_number: int = 1) -> Iterator[tuple[ParsedCommand, int]]:
+    """Lazily yield commands from text already passed through normalize_output().
     
-    for line in normalized.split("\n"):
-        parsed = parse_command_line(line)
+    Yields (ParsedCommand, page_number) tuples as lines are parsed.
+    """
+    for m in _RE_CANDIDATE_LINE.finditer(normalized):
+        parsed = parse_command_line(m.group(), already_ansi_stripped=True)
         if parsed is not None:
-            results.append((parsed, page_number))
-    
-    return results
+            yield parsed, page_number
@@ -4,16 +4,28 @@ Stores discovered commands with full provenance for auditing.
 """
 from __future__ import annotations
 
-import json
+import operator
+import sys
+import time
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from prefect import json_codec
 from prefect.discovery.parser import ParsedCommand
 
 
-@dataclass
+# Sort (key, entry) registry items by their key
+_by_key = operator.itemgetter(0)
+
+
+def normalize_key(name: str) -> str:
+    """Normalize a command name into a registry key (lowercase, no leading / or !)."""
+    return name.lstrip("/!").lower()
+
+
+@dataclass(slots=True)
 class CommandEntry:
     """A discovered command with full metadata."""
     key: str  # Normalized de-dupe key
@@ -37,12 +49,14 @@ class CommandEntry:
     
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> CommandEntry:
+        name = data["name"]
         return cls(
             key=data["key"],
-            name=data["name"],
-            syntax=data.get("syntax", data["name"]),
+            name=name,
+            syntax=data.get("syntax", name),
             description=data.get("description", ""),
-            source=data.get("source", "help"),
+            # A handful of distinct values shared by every entry; intern so they share one object.
+            source=sys.intern(data.get("source", "help")),
             page=data.get("page", 1),
             raw_line=data.get("raw_line", ""),
         )
@@ -60,7 +74,7 @@ class CommandEntry:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class DiscoveryMetadata:
     """Metadata about the discovery session."""
     pages_attempted: int = 0
@@ -97,14 +111,18 @@ class CommandRegistry:
     
     def add(self, entry: CommandEntry) -> bool:
         """Add a command entry. Returns True if new, False if duplicate."""
-        if entry.key in self.commands:
+        key = normalize_key(entry.key)
+        if key in self.commands:
             return False
-        self.commands[entry.key] = entry
+        self.commands[key] = entry
         return True
     
     def get(self, key: str) -> CommandEntry | None:
-        """Get command by normalized key."""
-        return self.commands.get(key.lstrip("/!").lower())
+        """Get command by key; the name is normalized if it isn't a key already."""
+        entry = self.commands.get(key)
+        if entry is None:
+            entry = self.commands.get(normalize_key(key))
+        return entry
     
     def __len__(self) -> int:
         return len(self.commands)
@@ -117,18 +135,18 @@ class CommandRegistry:
     
     def to_list(self) -> list[dict[str, Any]]:
         """Convert to list of dicts for JSON serialization."""
-        return [entry.to_dict() for entry in sorted(self.commands.values(), key=lambda e: e.key)]
+        return [entry.to_dict() for _, entry in sorted(self.commands.items(), key=_by_key)]
     
     @classmethod
     def from_list(cls, data: list[dict[str, Any]]) -> CommandRegistry:
         registry = cls()
         for item in data:
             entry = CommandEntry.from_dict(item)
-            registry.commands[entry.key] = entry
+            registry.commands[normalize_key(entry.key)] = entry
         return registry
 
 
-@dataclass
+@dataclass(slots=True)
 class DiscoverySnapshot:
     """A complete snapshot of a discovery session."""
     server_root: str
@@ -156,23 +174,21 @@ class DiscoverySnapshot:
     def save(self, path: Path) -> None:
         """Save snapshot to JSON file."""
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        path.write_bytes(json_codec.dumps(self.to_dict(), indent=True))
     
     @classmethod
     def load(cls, path: Path) -> DiscoverySnapshot:
         """Load snapshot from JSON file."""
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return cls.from_dict(data)
+        return cls.from_dict(json_codec.loads(path.read_bytes()))
     
     @classmethod
     def create(cls, server_root: Path | str) -> DiscoverySnapshot:
         """Create a new empty snapshot with current timestamp."""
-        now = datetime.now(timezone.utc).astimezone()
+        # Local time with its UTC offset. The zone is looked up per call rather
+        # than cached, so a long-running server follows DST changes.
         return cls(
             server_root=str(server_root),
-            captured_at=now.isoformat(),
+            captured_at=datetime.now().astimezone().isoformat(),
             help=DiscoveryMetadata(),
             commands=CommandRegistry(),
         )
@@ -180,5 +196,4 @@ class DiscoverySnapshot:
 
 def generate_snapshot_filename() -> str:
     """Generate a timestamped snapshot filename."""
-    now = datetime.now()
-    return f"commands-{now.strftime('%Y%m%d-%H%M%S')}.json"
+    return time.strftime("commands-%Y%m%d-%H%M%S.json")
@@ -0,0 +1,46 @@
+"""JSON encoding shared by Prefect's on-disk files.
+
+Uses orjson when it is installed (``pip install -e '.[speedups]'``) and falls
+back to the standard library otherwise. Both paths read each other's output.
+ijson, from the same extra, lets iter_array() stream large files.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Iterator
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional speedup
+    ijson = None
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """Encode obj as UTF-8 JSON bytes; compact unless indent (2 spaces) is set."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+loads = orjson.loads if orjson is not None else json.loads
+
+
+def iter_array(path: Path, key: str) -> Iterator[Any]:
+    """Yield the items of the top-level array obj[key] in the JSON file at path.
+    
+    With ijson the file is parsed incrementally, so only one item is held in
+    memory at a time; otherwise the whole document is loaded first.
+    """
+    if ijson is not None:
+        with open(path, "rb") as f:
+            yield from ijson.items(f, f"{key}.item", use_float=True)
+        return
+    yield from loads(Path(path).read_bytes()).get(key, [])
@@ -5,11 +5,15 @@ that an LLM can choose from based on user intent.
 """
 from __future__ import annotations
 
+import functools
 import logging
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Literal, Mapping
+
+from prefect import json_codec
 
 if TYPE_CHECKING:
     from prefect.discovery.registry import CommandEntry
@@ -20,46 +24,65 @@ logger = logging.getLogger(__name__)
 # Matches: <required>, [optional], [<optionalNamed>], <name/with/options>
 _PARAM_PATTERN = re.compile(
     r"""
-    \[<([^>]+)>\]  |  # [<optionalNamed>] - optional with angle brackets
-    <([^>]+)>      |  # <required> - required parameter
-    \[([^\]]+)\]      # [optional] - optional parameter
+    \[<(?P<optnamed>[^>]+)>\]  |  # [<optionalNamed>] - optional with angle brackets
+    <(?P<required>[^>]+)>      |  # <required> - required parameter
+    \[(?P<optbare>[^\]]+)\]      # [optional] - optional parameter
     """,
     re.VERBOSE,
 )
 
+RiskLevel = Literal["safe", "moderate", "dangerous", "unknown"]
+
+# A command name: lowercase ASCII letter, then ASCII letters/digits
+_CMD_NAME_RE = re.compile(r"^[a-z][a-zA-Z0-9]*$")
+_NON_IDENT_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+_LEADING_DIGITS = re.compile(r"^[0-9]+")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class CommandParameter:
-    """A parameter extracted from command syntax."""
+    """A parameter extracted from command syntax.
+    
+    Immutable, because parse_command_syntax() shares instances between tools
+    with the same syntax.
+    """
     
     name: str
     required: bool
-    choices: list[str] = field(default_factory=list)
+    choices: tuple[str, ...] = ()
     description: str = ""
-    
-    @property
-    def clean_name(self) -> str:
-        """Parameter name suitable for use as a function argument."""
+    # Parameter name suitable for use as a function argument; derived from name.
+    clean_name: str = field(init=False, repr=False, compare=False)
+    # JSON schema property, built once since every input to it is fixed.
+    _schema: Mapping[str, Any] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        if not isinstance(self.choices, tuple):
+            object.__setattr__(self, "choices", tuple(self.choices))
         # Convert "player1" -> "player1", "message/reason" -> "message_or_reason"
-        name = self.name.replace("/", "_or_")
-        name = re.sub(r"[^a-zA-Z0-9_]", "_", name)
+        name = _NON_IDENT_CHARS.sub("_", self.name.replace("/", "_or_"))
         # Remove leading digits
-        name = re.sub(r"^[0-9]+", "", name)
-        return name or "arg"
+        name = _LEADING_DIGITS.sub("", name)
+        object.__setattr__(self, "clean_name", name or "arg")
+        
+        description = self.description or f"The {self.name} parameter"
+        schema: dict[str, Any] = {"type": "string"}
+        if self.choices:
+            schema["description"] = f"{description} (options: {', '.join(self.choices)})"
+            schema["enum"] = self.choices
+        else:
+            schema["description"] = description
+        object.__setattr__(self, "_schema", MappingProxyType(schema))
     
     def to_schema(self) -> dict[str, Any]:
-        """Convert to JSON schema property definition."""
-        schema: dict[str, Any] = {
-            "type": "string",
-            "description": self.description or f"The {self.name} parameter",
-        }
+        """Convert to JSON schema property definition (a new dict on every call)."""
+        schema = dict(self._schema)
         if self.choices:
-            schema["enum"] = self.choices
-            schema["description"] += f" (options: {', '.join(self.choices)})"
+            schema["enum"] = list(self.choices)
         return schema
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandToolDefinition:
     """A tool definition generated from a discovered command."""
     
@@ -68,7 +91,12 @@ class CommandToolDefinition:
     description: str
     parameters: list[CommandParameter] = field(default_factory=list)
     category: str = "general"
-    risk_level: str = "unknown"  # safe, moderate, dangerous
+    risk_level: RiskLevel = "unknown"
+    # Input schema properties and required names, built on the first
+    # to_tool_schema() call; `parameters` is not changed after construction.
+    _input_schema: tuple[dict[str, dict[str, Any]], tuple[str, ...]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     @property
     def tool_name(self) -> str:
@@ -86,19 +114,21 @@ class CommandToolDefinition:
         return [p for p in self.parameters if not p.required]
     
     def to_tool_schema(self) -> dict[str, Any]:
-        """Generate the JSON schema for this tool's input."""
-        properties: dict[str, Any] = {}
-        required: list[str] = []
-        
-        for param in self.parameters:
-            properties[param.clean_name] = param.to_schema()
-            if param.required:
-                required.append(param.clean_name)
+        """Generate the JSON schema for this tool's input (a new dict on every call)."""
+        if self._input_schema is None:
+            self._input_schema = (
+                {p.clean_name: p.to_schema() for p in self.parameters},
+                tuple(p.clean_name for p in self.parameters if p.required),
+            )
+        properties, required = self._input_schema
         
         return {
             "type": "object",
-            "properties": properties,
-            "required": required,
+            "properties": {
+                name: {**prop, "enum": list(prop["enum"])} if "enum" in prop else dict(prop)
+                for name, prop in properties.items()
+            },
+            "required": list(required),
         }
     
     def build_command_string(self, **kwargs: str) -> str:
@@ -126,7 +156,7 @@ def parse_command_syntax(syntax: str) -> list[CommandParameter]:
     """Parse command syntax string to extract parameters.
     
     Examples:
-        "help [<page/command>]" -> [CommandParameter(name="page/command", required=False, choices=["page", "command"])]
+        "help [<page/command>]" -> [CommandParameter(name="page/command", required=False, choices=("page", "command"))]
         "ban <authentication/name>" -> [CommandParameter(name="authentication/name", required=True)]
         "buff [<player>] <buff> [<seconds>]" -> 3 parameters
     
@@ -136,30 +166,25 @@ def parse_command_syntax(syntax: str) -> list[CommandParameter]:
     Returns:
         List of extracted CommandParameter objects
     """
+    return list(_parse_command_syntax_cached(syntax))
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_command_syntax_cached(syntax: str) -> tuple[CommandParameter, ...]:
+    # Many commands share a syntax shape (every "<player>" command), so parse each once.
     params: list[CommandParameter] = []
     
     # Find all parameter matches
     for match in _PARAM_PATTERN.finditer(syntax):
-        optional_named = match.group(1)  # [<name>]
-        required = match.group(2)         # <name>
-        optional_bare = match.group(3)    # [name]
-        
-        if optional_named:
-            name = optional_named
-            is_required = False
-        elif required:
-            name = required
-            is_required = True
-        elif optional_bare:
-            name = optional_bare
-            is_required = False
-        else:
-            continue
+        # Exactly one alternative matches, and lastgroup names it
+        kind = match.lastgroup
+        name = match.group(kind)
+        is_required = kind == "required"
         
         # Extract choices if name contains /
-        choices: list[str] = []
+        choices: tuple[str, ...] = ()
         if "/" in name:
-            choices = [c.strip() for c in name.split("/")]
+            choices = tuple(c.strip() for c in name.split("/"))
         
         params.append(CommandParameter(
             name=name,
@@ -167,60 +192,87 @@ def parse_command_syntax(syntax: str) -> list[CommandParameter]:
             choices=choices,
         ))
     
-    return params
+    return tuple(params)
+
 
+# Risk keywords match anywhere in the command name (e.g. "unban", "setpassword").
+_DANGEROUS_KEYWORDS = frozenset({
+    "ban", "kick", "delete", "clear", "regen", "die", "save",
+    "password", "permissions", "op", "deop", "unban",
+})
+_MODERATE_KEYWORDS = frozenset({
+    "give", "buff", "hp", "mana", "spawn", "tp", "set", "time",
+    "rain", "raid", "enchant", "upgrade",
+})
+_DANGEROUS_RE = re.compile("|".join(sorted(_DANGEROUS_KEYWORDS)))
+_MODERATE_RE = re.compile("|".join(sorted(_MODERATE_KEYWORDS)))
 
-def categorize_command(name: str, syntax: str) -> tuple[str, str]:
+# Category keywords, checked in order (more specific matches first). Each entry
+# is (category, keywords, exact): exact entries must equal the whole name,
+# others may appear anywhere in it.
+_CATEGORY_RULES: tuple[tuple[str, tuple[str, ...], bool], ...] = (
+    ("moderation", ("ban", "kick", "unban", "permissions", "op"), False),
+    ("info", ("players", "playernames"), True),
+    ("player", ("player", "tp", "hp", "mana", "buff", "hunger"), False),
+    ("world", ("spawn", "mob", "raid", "event"), False),
+    ("team", ("team", "invite"), False),
+    ("admin", ("save", "settings", "password", "motd"), False),
+    ("items", ("give", "item", "armor", "enchant", "upgrade"), False),
+    ("environment", ("time", "rain", "difficulty"), False),
+    ("info", ("help", "players", "levels", "network"), False),
+)
+
+# One anchored match decides the category: alternatives are tried in rule
+# order, each an empty named group guarded by a lookahead, so lastgroup names
+# the first rule that applies.
+_CATEGORY_RE = re.compile(
+    "|".join(
+        f"(?P<r{i}>(?=(?:{'|'.join(keywords)})\\Z))" if exact
+        else f"(?P<r{i}>(?=.*?(?:{'|'.join(keywords)})))"
+        for i, (_, keywords, exact) in enumerate(_CATEGORY_RULES)
+    ),
+    re.DOTALL,
+)
+_CATEGORY_BY_GROUP = {f"r{i}": category for i, (category, _, _) in enumerate(_CATEGORY_RULES)}
+
+
+def categorize_command(name: str, syntax: str) -> tuple[str, RiskLevel]:
     """Categorize a command and assess its risk level.
     
+    Both values are string constants from this module, so tools share them
+    rather than holding copies.
+    
     Returns:
         Tuple of (category, risk_level)
     """
     name_lower = name.lower()
-    syntax_lower = syntax.lower()
     
     # Risk assessment
-    dangerous_keywords = {
-        "ban", "kick", "delete", "clear", "regen", "die", "save",
-        "password", "permissions", "op", "deop", "unban",
-    }
-    moderate_keywords = {
-        "give", "buff", "hp", "mana", "spawn", "tp", "set", "time",
-        "rain", "raid", "enchant", "upgrade",
-    }
-    
-    if name_lower in dangerous_keywords or any(k in name_lower for k in dangerous_keywords):
+    if _DANGEROUS_RE.search(name_lower):
         risk = "dangerous"
-    elif name_lower in moderate_keywords or any(k in name_lower for k in moderate_keywords):
+    elif _MODERATE_RE.search(name_lower):
         risk = "moderate"
     else:
         risk = "safe"
     
-    # Category assignment (order matters - more specific matches first)
-    if any(k in name_lower for k in ["ban", "kick", "unban", "permissions", "op"]):
-        category = "moderation"
-    elif name_lower in {"players", "playernames"}:
-        category = "info"
-    elif any(k in name_lower for k in ["player", "tp", "hp", "mana", "buff", "hunger"]):
-        category = "player"
-    elif any(k in name_lower for k in ["spawn", "mob", "raid", "event"]):
-        category = "world"
-    elif any(k in name_lower for k in ["team", "invite"]):
-        category = "team"
-    elif any(k in name_lower for k in ["save", "settings", "password", "motd"]):
-        category = "admin"
-    elif any(k in name_lower for k in ["give", "item", "armor", "enchant", "upgrade"]):
-        category = "items"
-    elif any(k in name_lower for k in ["time", "rain", "difficulty"]):
-        category = "environment"
-    elif any(k in name_lower for k in ["help", "players", "levels", "network"]):
-        category = "info"
-    else:
-        category = "general"
+    m = _CATEGORY_RE.match(name_lower)
+    category = _CATEGORY_BY_GROUP[m.lastgroup] if m else "general"
     
     return category, risk
 
 
+def _is_command_name(name: str) -> bool:
+    """Whether a discovered name can be a real command."""
+    # Skip noise entries
+    if len(name) < 2:
+        return False
+    
+    # Skip entries that look like log messages (start with capital letter)
+    # or contain invalid characters for a command.
+    # Real commands are lowercase (e.g., "help", "ban", "kick")
+    return _CMD_NAME_RE.match(name) is not None
+
+
 def create_tool_definition(entry: "CommandEntry") -> CommandToolDefinition | None:
     """Create a tool definition from a CommandEntry.
     
@@ -230,17 +282,7 @@ def create_tool_definition(entry: "CommandEntry") -> CommandToolDefinition | Non
     Returns:
         CommandToolDefinition or None if the entry is invalid
     """
-    # Skip noise entries
-    if not entry.name or len(entry.name) < 2:
-        return None
-    
-    # Skip entries that look like log messages (start with capital letter)
-    # Real commands are lowercase (e.g., "help", "ban", "kick")
-    if entry.name[0].isupper():
-        return None
-    
-    # Skip if name contains invalid characters for a command
-    if not re.match(r"^[a-zA-Z][a-zA-Z0-9]*$", entry.name):
+    if not _is_command_name(entry.name):
         return None
     
     params = parse_command_syntax(entry.syntax)
@@ -261,10 +303,55 @@ class CommandToolRegistry:
     
     def __init__(self) -> None:
         self._tools: dict[str, CommandToolDefinition] = {}
+        # Secondary indexes kept in registration order, so lookups by category
+        # or risk level don't scan every tool.
+        self._by_category: dict[str, list[CommandToolDefinition]] = {}
+        self._by_risk: dict[str, list[CommandToolDefinition]] = {}
+        # describe_for_llm() output; cleared whenever a tool is registered.
+        self._desc_cache: str | None = None
     
     def register(self, tool: CommandToolDefinition) -> None:
         """Register a tool definition."""
+        self._desc_cache = None
+        replacing = tool.tool_name in self._tools
         self._tools[tool.tool_name] = tool
+        if replacing:
+            # Rare: rebuild so the indexes keep the same order as _tools.
+            self._reindex()
+        else:
+            self._by_category.setdefault(tool.category, []).append(tool)
+            self._by_risk.setdefault(tool.risk_level, []).append(tool)
+    
+    def _reindex(self) -> None:
+        self._by_category = {}
+        self._by_risk = {}
+        for tool in self._tools.values():
+            self._by_category.setdefault(tool.category, []).append(tool)
+            self._by_risk.setdefault(tool.risk_level, []).append(tool)
+    
+    def describe_for_llm(self) -> str:
+        """Markdown listing of the tools by category, for LLM context.
+        
+        The registry is effectively read-only once loaded, so the text is built
+        once and reused until another tool is registered.
+        """
+        if self._desc_cache is not None:
+            return self._desc_cache
+        
+        lines = ["# Available Necesse Server Commands\n"]
+        
+        for category in sorted(self._by_category):
+            lines.append(f"\n## {category.title()}\n")
+            tools = sorted(self._by_category[category], key=lambda t: t.command_name)
+            
+            for tool in tools:
+                risk_indicator = _RISK_INDICATORS.get(tool.risk_level, "?")
+                lines.append(f"- **{tool.command_name}** {risk_indicator}: `{tool.syntax}`")
+                if tool.description:
+                    lines.append(f"  {tool.description}")
+        
+        self._desc_cache = "\n".join(lines)
+        return self._desc_cache
     
     def get(self, name: str) -> CommandToolDefinition | None:
         """Get a tool by name (with or without necesse. prefix)."""
@@ -274,11 +361,11 @@ class CommandToolRegistry:
     
     def get_by_category(self, category: str) -> list[CommandToolDefinition]:
         """Get all tools in a category."""
-        return [t for t in self._tools.values() if t.category == category]
+        return list(self._by_category.get(category, ()))
     
     def get_safe_tools(self) -> list[CommandToolDefinition]:
         """Get all tools marked as safe."""
-        return [t for t in self._tools.values() if t.risk_level == "safe"]
+        return list(self._by_risk.get("safe", ()))
     
     def all_tools(self) -> list[CommandToolDefinition]:
         """Get all registered tools."""
@@ -302,17 +389,16 @@ def load_tools_from_snapshot(snapshot_path: Path) -> CommandToolRegistry:
     Returns:
         CommandToolRegistry populated with tools
     """
-    import json
     from prefect.discovery.registry import CommandEntry
     
     registry = CommandToolRegistry()
     
-    with open(snapshot_path) as f:
-        data = json.load(f)
-    
-    commands = data.get("commands", [])
-    
-    for cmd_data in commands:
+    # Streamed when ijson is available, so large snapshots aren't held in memory whole.
+    for cmd_data in json_codec.iter_array(Path(snapshot_path), "commands"):
+        # Noisy snapshots are mostly invalid names; reject those before building an entry.
+        if not _is_command_name(cmd_data.get("name", "")):
+            logger.debug(f"Skipped invalid entry: {cmd_data.get('name', 'unknown')}")
+            continue
         entry = CommandEntry.from_dict(cmd_data)
         tool = create_tool_definition(entry)
         if tool:
@@ -325,31 +411,13 @@ def load_tools_from_snapshot(snapshot_path: Path) -> CommandToolRegistry:
     return registry
 
 
+_RISK_INDICATORS = {"safe": "✓", "moderate": "⚠", "dangerous": "⛔"}
+
+
 def get_tool_descriptions_for_llm(registry: CommandToolRegistry) -> str:
     """Generate a formatted description of all tools for LLM context.
     
     This provides the LLM with information about available commands
     to help it choose the right one.
     """
-    lines = ["# Available Necesse Server Commands\n"]
-    
-    # Group by category
-    categories: dict[str, list[CommandToolDefinition]] = {}
-    for tool in registry.all_tools():
-        if tool.category not in categories:
-            categories[tool.category] = []
-        categories[tool.category].append(tool)
-    
-    for category in sorted(categories.keys()):
-        lines.append(f"\n## {category.title()}\n")
-        tools = sorted(categories[category], key=lambda t: t.command_name)
-        
-        for tool in tools:
-            risk_indicator = {"safe": "✓", "moderate": "⚠", "dangerous": "⛔"}.get(
-                tool.risk_level, "?"
-            )
-            lines.append(f"- **{tool.command_name}** {risk_indicator}: `{tool.syntax}`")
-            if tool.description:
-                lines.append(f"  {tool.description}")
-    
-    return "\n".join(lines)
+    return registry.describe_for_llm()
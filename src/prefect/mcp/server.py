@@ -8,6 +8,16 @@ from prefect.mcp.tools import PrefectCore
 logger = logging.getLogger(__name__)
 
 
+def _command_tool(core: PrefectCore, cmd_name: str):
+    """Return the handler for the prefect.cmd.<cmd_name> tool."""
+
+    def _tool(args: str = "") -> dict:
+        args = args.strip()
+        return core.run_command(f"{cmd_name} {args}" if args else cmd_name)
+
+    return _tool
+
+
 def _build_server():
     # Using the standard MCP Python SDK (mcp) if installed.
     from mcp.server.fastmcp import FastMCP
@@ -21,17 +31,7 @@ def _build_server():
     # Dynamically create one tool per configured command.
     # Each tool takes a single free-form args string (kept small by sanitizer limits).
     for cmd in core.command_names:
-        tool_name = f"prefect.cmd.{cmd}"
-
-        def _make(cmd_name: str):
-            @mcp.tool(name=f"prefect.cmd.{cmd_name}")
-            def _tool(args: str = "") -> dict:
-                full = cmd_name if not args.strip() else f"{cmd_name} {args.strip()}"
-                return core.run_command(full)
-
-            return _tool
-
-        _make(cmd)
+        mcp.tool(name=f"prefect.cmd.{cmd}")(_command_tool(core, cmd))
 
     @mcp.tool(name="prefect.get_status")
     def get_status() -> dict:
@@ -99,13 +99,13 @@ def _build_server():
         """
         return core.bootstrap_allowlist()
 
-    return mcp, settings
+    return mcp, settings, core
 
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO)
 
-    mcp, settings = _build_server()
+    mcp, settings, core = _build_server()
 
     transport = (settings.mcp_transport or "stdio").lower()
     logger.info(
@@ -114,13 +114,16 @@ def main() -> None:
         settings.server_root,
         settings.control_mode,
     )
-    if transport == "sse":
-        # Best-effort: depending on MCP SDK version, args may differ.
-        logger.info("Prefect MCP SSE listening on http://%s:%s", settings.mcp_host, settings.mcp_port)
-        mcp.run(transport="sse", host=settings.mcp_host, port=settings.mcp_port)
-    else:
-        logger.info("Prefect MCP stdio ready (waiting for MCP client)")
-        mcp.run()
+    try:
+        if transport == "sse":
+            # Best-effort: depending on MCP SDK version, args may differ.
+            logger.info("Prefect MCP SSE listening on http://%s:%s", settings.mcp_host, settings.mcp_port)
+            mcp.run(transport="sse", host=settings.mcp_host, port=settings.mcp_port)
+        else:
+            logger.info("Prefect MCP stdio ready (waiting for MCP client)")
+            mcp.run()
+    finally:
+        core.shutdown()
 
 
 if __name__ == "__main__":
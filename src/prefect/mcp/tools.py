@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
+import functools
 import logging
-import queue
+import os
+import re
+import signal
 import subprocess
 import threading
 import time
-from collections import deque
-from dataclasses import asdict
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal
+from typing import Any, Callable, Coroutine, Literal, TypeVar
 
 from prefect.config import PrefectSettings, get_settings
 from prefect.command_catalog import load_command_names
@@ -18,7 +22,7 @@ from prefect.discovery.discoverer import CommandDiscoverer, ConsoleResult
 from prefect.discovery.bootstrap import AllowlistBootstrapper, GeneratedAllowlist
 from prefect.discovery.registry import DiscoverySnapshot
 from prefect.ollama_client import OllamaClient, OllamaConfig
-from prefect.persona import PersonaManager, Persona
+from prefect.persona import PersonaManager, Persona, PersonaParameters
 from prefect.player_events import PlayerTracker, PlayerEventHandler, build_welcome_prompt
 from prefect.safety.allowlist import CommandAllowlist, CommandNotPermittedError
 from prefect.safety.sanitizer import (
@@ -28,7 +32,7 @@ from prefect.safety.sanitizer import (
     sanitize_startup_reply,
 )
 from prefect.server_control.command_runner import CommandRunner
-from prefect.server_control.controller import ManagedController, TmuxAttachController
+from prefect.server_control.controller import ManagedController, TmuxAttachController, status_to_dict
 from prefect.server_control.process_manager import BedrockProcessManager, NecesseProcessManager
 from prefect.server_control.probes import tcp_port_open
 from prefect.watchers.log_tail import RollingLogBuffer
@@ -36,29 +40,151 @@ from prefect.bedrock_updater import update_bedrock_server_in_place
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+_E = TypeVar("_E", bound=tuple)
+
+# After a chat mention arrives, wait this long for more before replying, so a
+# burst is handled as one batch with at most one reply per player.
+_CHAT_BATCH_WINDOW_SECONDS = 0.2
+_CHAT_BATCH_MAX = 32
+# Per-player reply cooldowns remembered; the least recently answered are dropped.
+_PLAYER_COOLDOWN_MAX = 10_000
+# Joins waiting for a welcome; beyond this they are only recorded, not welcomed.
+_JOIN_QUEUE_MAX = 256
+
 
 _DISALLOWED_FOR_ANNOUNCE = set(";|&><$`\\(){}[]")
+# Line breaks become spaces; disallowed characters are dropped.
+_SAFE_CHAT_TABLE = str.maketrans(
+    {"\n": " ", "\r": " ", **dict.fromkeys(_DISALLOWED_FOR_ANNOUNCE)}
+)
 
 
 def _coerce_safe_chat_text(text: str, *, max_len: int) -> str:
-    value = (text or "").replace("\n", " ").replace("\r", " ")
-    value = "".join(ch for ch in value if ch not in _DISALLOWED_FOR_ANNOUNCE)
-    value = " ".join(value.split())
+    value = " ".join((text or "").translate(_SAFE_CHAT_TABLE).split())
     if len(value) > max_len:
         value = value[: max_len - 1].rstrip() + "…"
     return value
 
 
+_UNKNOWN_CMD_RE = re.compile(
+    r"unknown command|not recognized|unrecognized|invalid command|no such command",
+    re.IGNORECASE,
+)
+
+
 def _looks_like_unknown_command(output: str) -> bool:
-    text = (output or "").lower()
-    needles = (
-        "unknown command",
-        "not recognized",
-        "unrecognized",
-        "invalid command",
-        "no such command",
-    )
-    return any(n in text for n in needles)
+    return _UNKNOWN_CMD_RE.search(output or "") is not None
+
+
+# Common readiness markers in server logs.
+_READY_RE = re.compile(r"server started|listening|done|loaded|world", re.IGNORECASE)
+
+
+_DEFAULT_ANNOUNCE_TEMPLATES = ("say {message}",)
+
+# PrefectCore components created on first use that the agent worker threads share.
+_AGENT_COMPONENTS = (
+    "ollama",
+    "persona_manager",
+    "player_tracker",
+    "player_event_handler",
+    "bedrock_player_tracker",
+    "bedrock_player_event_handler",
+    "conversation_store",
+    "bedrock_conversation_store",
+)
+
+
+def _parse_templates(raw: str | None) -> tuple[str, ...]:
+    """Split a comma-separated list of command templates, dropping blanks."""
+    return tuple(t.strip() for t in (raw or "").split(",") if t.strip())
+
+
+def _split_trusted_template(tmpl: str, allowlist: CommandAllowlist) -> tuple[str, str] | None:
+    """Split tmpl around its single {message} slot if every fill is already safe.
+
+    That holds when the text before the slot is allow-listed on its own (so any
+    message appended to it is too) and the fixed text is free of unsafe
+    characters; a sanitize_announce()d message can then be sent without
+    re-running sanitize_command() and the allowlist. Otherwise returns None.
+    """
+    if tmpl.count("{message}") != 1:
+        return None
+    head, tail = tmpl.split("{message}")
+    if not allowlist.is_allowed(head):
+        return None
+    try:
+        sanitize_command(head + tail, max_length=len(tmpl))
+    except UnsafeInputError:
+        return None
+    return head, tail
+
+
+def _events_since(events: deque[_E], since_ts: float) -> list[_E]:
+    """Return the events with ts (first field) >= since_ts, oldest first.
+
+    Events are appended in time order, so walk back from the newest one and
+    stop at the first older event instead of copying and filtering the whole
+    deque; pollers usually only have a few new events.
+    """
+    newer: list[_E] = []
+    for event in reversed(events):
+        if event[0] < since_ts:
+            break
+        newer.append(event)
+    newer.reverse()
+    return newer
+
+
+def _terminate_matching(pattern: str) -> list[int]:
+    """SIGTERM every process whose command line matches pattern; return the signalled PIDs.
+
+    One pgrep scan finds the candidates, so the usual "nothing to kill" case
+    costs a single fork instead of one pkill per pattern.
+    """
+    out = subprocess.run(["pgrep", "-f", pattern], check=False, capture_output=True, text=True)
+    own_pid = os.getpid()
+    killed: list[int] = []
+    for tok in (out.stdout or "").split():
+        try:
+            pid = int(tok)
+        except ValueError:
+            continue
+        if pid == own_pid:
+            continue
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            continue
+        killed.append(pid)
+    return killed
+
+
+async def _gather_settled(coros: list[Coroutine[Any, Any, _T]]) -> list[_T | BaseException]:
+    return await asyncio.gather(*coros, return_exceptions=True)
+
+
+@dataclass(frozen=True, slots=True)
+class _ReplyJob:
+    """A chat reply whose prompt is built and is waiting on Ollama."""
+
+    server_kind: Literal["necesse", "bedrock"]
+    player: str
+    system_prompt: str
+    user_prompt: str
+    params: PersonaParameters
+    store: ConversationHistoryStore
+    announce_fn: Callable[[str], dict]
+    controller: ManagedController | TmuxAttachController
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
 
 
 class PrefectCore:
@@ -136,66 +262,112 @@ class PrefectCore:
         self.bedrock_command_runner = CommandRunner(self.bedrock_controller)
 
         # Convert command names into safe allowlist prefixes.
-        # For single-word commands like "help" allow exact match; for arg commands, allow "cmd " prefix.
-        extra_prefixes: list[str] = []
-        for name in self.command_names:
-            extra_prefixes.append(name)
-            extra_prefixes.append(name + " ")
+        # The bare name covers both "cmd" and "cmd <args>", since allowlist entries are prefixes.
+        extra_prefixes: list[str] = list(self.command_names)
+
+        # Announce command templates, parsed once; settings are fixed after startup.
+        templates = _parse_templates(self.settings.announce_command_templates)
+        self._announce_templates = templates or _DEFAULT_ANNOUNCE_TEMPLATES
+        self._bedrock_announce_templates = (
+            _parse_templates(self.settings.bedrock_announce_command_templates) or _DEFAULT_ANNOUNCE_TEMPLATES
+        )
 
         # Also allow announce candidates based on templates.
-        templates = [t.strip() for t in (self.settings.announce_command_templates or "").split(",") if t.strip()]
         for tmpl in templates:
-            cmd_token = tmpl.strip().split(" ", 1)[0]
+            cmd_token = tmpl.split(" ", 1)[0]
             if cmd_token:
                 extra_prefixes.append(cmd_token)
-                extra_prefixes.append(cmd_token + " ")
 
         self.allowlist = CommandAllowlist.default(extra_prefixes=tuple(extra_prefixes))
-        self.ollama = OllamaClient(OllamaConfig(base_url=self.settings.ollama_url, model=self.settings.model))
+        self._announce_parts = tuple(_split_trusted_template(t, self.allowlist) for t in self._announce_templates)
+        # Ollama, personas, player tracking and conversation history are built on
+        # first use (see the cached properties below); several of them read state
+        # from disk that status/command-only callers never need.
 
-        # Persona management
-        self.persona_manager = PersonaManager()
+        self._started = False
+        self._start_time = time.time()
 
-        # Player tracking and welcome messages
-        self.player_tracker = PlayerTracker()
-        self.player_event_handler = PlayerEventHandler(
+        # Single producer (log reader) and single consumer (chat worker): a bounded
+        # deque plus a wakeup event, no Queue mutex/condition round trip per item.
+        self._chat_queue: deque[tuple[Literal["necesse", "bedrock"], str, str]] = deque(maxlen=1024)
+        self._chat_wakeup = threading.Event()
+        self._chat_thread: threading.Thread | None = None
+        self._chat_stop = threading.Event()
+        self._last_player_reply_ts: OrderedDict[str, float] = OrderedDict()
+        # Chat settings are fixed for the process lifetime, so normalize them once.
+        self._mention_keyword = (self.settings.chat_mention_keyword or "prefect").lower()
+        # Leading mention forms stripped from a player's message, in the order they are tried.
+        self._mention_prefixes = (self._mention_keyword + ":", "@" + self._mention_keyword, self._mention_keyword)
+        # Matches a mention anywhere in a message we send; None when mentions are off.
+        self._mention_re: re.Pattern[str] | None = (
+            re.compile(re.escape(self._mention_keyword), re.IGNORECASE)
+            if self.settings.chat_mention_enabled
+            else None
+        )
+        self._chat_cooldown_s = float(self.settings.chat_cooldown_seconds)
+        # (persona, system_prompt, persona_prompt, full prompt) for the active persona
+        self._persona_prompt_cache: tuple[Persona, str, str, str] | None = None
+        # Player joins waiting for a welcome message; one worker thread drains them.
+        self._join_queue: deque[tuple[Literal["necesse", "bedrock"], str]] = deque(maxlen=_JOIN_QUEUE_MAX)
+        # Joins that overflowed the queue, counted per player; recorded without a welcome.
+        self._unwelcomed_joins: Counter[tuple[Literal["necesse", "bedrock"], str]] = Counter()
+        self._unwelcomed_lock = threading.Lock()
+        self._join_wakeup = threading.Event()
+        self._welcome_thread: threading.Thread | None = None
+        # Event loop for Ollama calls made from worker threads; started on first use.
+        self._aio_loop: asyncio.AbstractEventLoop | None = None
+        self._aio_lock = threading.Lock()
+
+    @functools.cached_property
+    def ollama(self) -> OllamaClient:
+        return OllamaClient(OllamaConfig(base_url=self.settings.ollama_url, model=self.settings.model))
+
+    @functools.cached_property
+    def persona_manager(self) -> PersonaManager:
+        return PersonaManager()
+
+    @functools.cached_property
+    def player_tracker(self) -> PlayerTracker:
+        return PlayerTracker()
+
+    @functools.cached_property
+    def player_event_handler(self) -> PlayerEventHandler:
+        return PlayerEventHandler(
             player_tracker=self.player_tracker,
             send_message=self._send_welcome_message,
             generate_message=self._generate_welcome_message,
             enabled=self.settings.welcome_messages_enabled,
         )
 
-        self.bedrock_player_tracker = PlayerTracker(
-            storage_path=Path.home() / ".config" / "prefect" / "bedrock_players.json"
-        )
-        self.bedrock_player_event_handler = PlayerEventHandler(
+    @functools.cached_property
+    def bedrock_player_tracker(self) -> PlayerTracker:
+        return PlayerTracker(storage_path=Path.home() / ".config" / "prefect" / "bedrock_players.json")
+
+    @functools.cached_property
+    def bedrock_player_event_handler(self) -> PlayerEventHandler:
+        return PlayerEventHandler(
             player_tracker=self.bedrock_player_tracker,
             send_message=self._send_bedrock_welcome_message,
             generate_message=self._generate_welcome_message,
             enabled=self.settings.welcome_messages_enabled,
         )
 
-        # Persistent conversation history for chat interactions
-        self.conversation_store = ConversationHistoryStore(
+    @functools.cached_property
+    def conversation_store(self) -> ConversationHistoryStore:
+        """Persistent conversation history for chat interactions."""
+        return ConversationHistoryStore(
             max_messages_per_player=self.settings.conversation_max_messages,
             max_message_age_days=self.settings.conversation_max_age_days,
         )
 
-        self.bedrock_conversation_store = ConversationHistoryStore(
+    @functools.cached_property
+    def bedrock_conversation_store(self) -> ConversationHistoryStore:
+        return ConversationHistoryStore(
             storage_path=Path.home() / ".config" / "prefect" / "bedrock_conversations.json",
             max_messages_per_player=self.settings.conversation_max_messages,
             max_message_age_days=self.settings.conversation_max_age_days,
         )
 
-        self._started = False
-        self._start_time = time.time()
-
-        self._chat_queue: "queue.Queue[tuple[Literal['necesse', 'bedrock'], str, str]]" = queue.Queue()
-        self._chat_thread: threading.Thread | None = None
-        self._chat_stop = threading.Event()
-        self._last_player_reply_ts: dict[str, float] = {}
-        self._chat_history: dict[str, deque[tuple[float, str, str]]] = {}
-
     def _on_chat_line(self, player: str, message: str) -> None:
         ts = time.time()
         with self._events_lock:
@@ -209,13 +381,8 @@ class PrefectCore:
         
         # Handle player join/leave for welcome messages
         if kind == "join":
-            # Run in a thread to avoid blocking the log parser
-            threading.Thread(
-                target=self._handle_player_join,
-                args=(who,),
-                name=f"prefect-welcome-{who}",
-                daemon=True,
-            ).start()
+            # Handled by the welcome worker to avoid blocking the log parser
+            self._queue_player_join("necesse", who)
         elif kind == "leave":
             self.player_event_handler.on_player_leave(who)
 
@@ -226,14 +393,36 @@ class PrefectCore:
             self._activity_events.append((ts, text))
 
         if kind == "join":
-            threading.Thread(
-                target=self._handle_bedrock_player_join,
-                args=(who,),
-                name=f"prefect-bedrock-welcome-{who}",
-                daemon=True,
-            ).start()
+            self._queue_player_join("bedrock", who)
         elif kind == "leave":
             self.bedrock_player_event_handler.on_player_leave(who)
+
+    def _queue_player_join(self, server_kind: Literal["necesse", "bedrock"], player_name: str) -> None:
+        # Called from the log reader thread; the welcome worker is the only consumer.
+        if len(self._join_queue) < _JOIN_QUEUE_MAX:
+            self._join_queue.append((server_kind, player_name))
+        else:
+            # Still record the visit, but skip the (slow) welcome message.
+            logger.warning("Welcome queue full; recording %s without a welcome", player_name)
+            with self._unwelcomed_lock:
+                self._unwelcomed_joins[(server_kind, player_name)] += 1
+        self._join_wakeup.set()
+
+    def _welcome_worker(self) -> None:
+        while not self._chat_stop.is_set():
+            self._join_wakeup.wait(timeout=0.25)
+            self._join_wakeup.clear()
+            while self._join_queue and not self._chat_stop.is_set():
+                server_kind, player_name = self._join_queue.popleft()
+                if server_kind == "bedrock":
+                    self._handle_bedrock_player_join(player_name)
+                else:
+                    self._handle_player_join(player_name)
+            with self._unwelcomed_lock:
+                unwelcomed, self._unwelcomed_joins = self._unwelcomed_joins, Counter()
+            for (server_kind, player_name), count in unwelcomed.items():
+                for _ in range(count):
+                    self._record_join_without_welcome(server_kind, player_name)
     
     def _handle_player_join(self, player_name: str) -> None:
         """Handle a player join event (runs in background thread)."""
@@ -252,6 +441,13 @@ class PrefectCore:
         except Exception as e:
             logger.error("Failed to handle bedrock player join for %s: %s", player_name, e)
     
+    def _record_join_without_welcome(self, server_kind: Literal["necesse", "bedrock"], player_name: str) -> None:
+        tracker = self.bedrock_player_tracker if server_kind == "bedrock" else self.player_tracker
+        try:
+            tracker.record_join(player_name)
+        except Exception as e:
+            logger.error("Failed to record player join for %s: %s", player_name, e)
+    
     def _send_welcome_message(self, message: str) -> None:
         """Send a welcome message to the server chat."""
         try:
@@ -274,12 +470,11 @@ class PrefectCore:
     
     def _generate_welcome_message(self, system_prompt: str, user_prompt: str) -> str:
         """Generate a welcome message using Ollama."""
-        persona = self.persona_manager.get_active_persona()
-        full_system = persona.get_full_system_prompt()
+        persona, full_system = self._get_active_prompt()
         params = persona.parameters
         
         try:
-            reply = asyncio.run(self.ollama.generate(
+            reply = self._run_coro(self.ollama.generate(
                 full_system,
                 user_prompt,
                 temperature=params.temperature,
@@ -292,25 +487,89 @@ class PrefectCore:
             logger.error("Ollama generate failed for welcome message: %s", e)
             return ""
 
+    def _get_active_prompt(self) -> tuple[Persona, str]:
+        """Return the active persona and its full system prompt, rebuilt only when either changes."""
+        persona = self.persona_manager.get_active_persona()
+        cached = self._persona_prompt_cache
+        # Identity checks: saving a persona replaces the object, and editing a prompt assigns a new string.
+        if (
+            cached is not None
+            and cached[0] is persona
+            and cached[1] is persona.system_prompt
+            and cached[2] is persona.persona_prompt
+        ):
+            return persona, cached[3]
+        full_prompt = persona.get_full_system_prompt()
+        self._persona_prompt_cache = (persona, persona.system_prompt, persona.persona_prompt, full_prompt)
+        return persona, full_prompt
+
     def get_chat_events(self, *, since_ts: float | None = None) -> list[tuple[float, str, str]]:
         with self._events_lock:
-            events = list(self._chat_events)
-        if since_ts is None:
-            return events
-        return [e for e in events if e[0] >= since_ts]
+            if since_ts is None:
+                return list(self._chat_events)
+            return _events_since(self._chat_events, since_ts)
 
     def get_activity_events(self, *, since_ts: float | None = None) -> list[tuple[float, str]]:
         with self._events_lock:
-            events = list(self._activity_events)
-        if since_ts is None:
-            return events
-        return [e for e in events if e[0] >= since_ts]
+            if since_ts is None:
+                return list(self._activity_events)
+            return _events_since(self._activity_events, since_ts)
 
     def start_agent(self) -> None:
         """Start background agent services (chat watcher, etc.) independent of game server."""
+        # Build the lazily created components the workers share before they
+        # start, so two threads never race to create the same one.
+        for name in _AGENT_COMPONENTS:
+            getattr(self, name)
+        self._start_welcome_thread()
         if self.settings.chat_mention_enabled:
             self._start_chat_thread()
 
+    def shutdown(self) -> None:
+        """Flush state that is persisted lazily (conversation history)."""
+        for name in ("conversation_store", "bedrock_conversation_store"):
+            store = self.__dict__.get(name)
+            if store is None:
+                continue
+            try:
+                store.flush()
+            except Exception as exc:
+                logger.error("Failed to flush conversation history: %s", exc)
+        ollama = self.__dict__.get("ollama")
+        if ollama is not None and self._aio_loop is not None:
+            # The connection pool belongs to the background loop, so close it
+            # there and wait for that before the loop is stopped.
+            try:
+                self._run_coro(ollama.aclose(), timeout=2)
+            except Exception as exc:
+                logger.debug("Failed to close Ollama connections: %s", exc)
+        with self._aio_lock:
+            loop, self._aio_loop = self._aio_loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+    def _submit_coro(self, coro: Coroutine[Any, Any, _T]) -> concurrent.futures.Future[_T]:
+        """Schedule a coroutine on the shared background event loop.
+
+        All Ollama calls go through this one loop, so the client's connection
+        pool stays bound to it.
+        """
+        with self._aio_lock:
+            if self._aio_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=_run_loop, args=(loop,), name="prefect-asyncio", daemon=True).start()
+                self._aio_loop = loop
+            loop = self._aio_loop
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def _run_coro(self, coro: Coroutine[Any, Any, _T], *, timeout: float | None = None) -> _T:
+        """Run a coroutine on the shared background event loop and wait for its result.
+
+        Reusing one loop avoids building and tearing down a loop per call the way
+        asyncio.run() does. Must not be called from the loop's own thread.
+        """
+        return self._submit_coro(coro).result(timeout)
+
     def start(self) -> None:
         if self._started:
             return
@@ -461,7 +720,7 @@ class PrefectCore:
             return {
                 "ok": True,
                 "download_url": result.download_url,
-                "backup_dir": str(result.backup_dir),
+                "backup_dir": str(result.backup_dir) if result.backup_dir is not None else None,
             }
         except Exception as exc:
             logger.exception("Bedrock update failed")
@@ -471,8 +730,12 @@ class PrefectCore:
     def kill_bedrock_zombie_processes(self) -> dict:
         """Force kill any lingering Bedrock server processes."""
         try:
-            subprocess.run(["pkill", "-f", "bedrock_server"], check=False)
-            return {"ok": True, "message": "Sent kill signal to processes matching: bedrock_server"}
+            pids = _terminate_matching("bedrock_server")
+            return {
+                "ok": True,
+                "message": f"Sent kill signal to {len(pids)} process(es) matching: bedrock_server",
+                "pids": pids,
+            }
         except Exception as exc:
             return {"ok": False, "error": str(exc)}
 
@@ -481,18 +744,13 @@ class PrefectCore:
         # We target common patterns for the Necesse server.
         # 1. "Server.jar" (the actual game)
         # 2. "StartServer" (the launcher script)
-        
-        killed = []
         try:
-            # Try killing java processes running Server.jar
-            subprocess.run(["pkill", "-f", "Server.jar"], check=False)
-            killed.append("Server.jar")
-            
-            # Try killing the launcher script
-            subprocess.run(["pkill", "-f", "StartServer"], check=False)
-            killed.append("StartServer")
-            
-            return {"ok": True, "message": f"Sent kill signals to: {', '.join(killed)}"}
+            pids = _terminate_matching("Server.jar|StartServer")
+            return {
+                "ok": True,
+                "message": f"Sent kill signals to {len(pids)} process(es) matching: Server.jar, StartServer",
+                "pids": pids,
+            }
         except Exception as exc:
             return {"ok": False, "error": str(exc)}
 
@@ -500,18 +758,20 @@ class PrefectCore:
 
     def _run_command_for_discovery(self, cmd: str) -> ConsoleResult:
         """Execute a command and return result for discovery (no allowlist check)."""
+        # Stamped once, when the command is sent.
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S%z")
         try:
             output = self.command_runner.run(cmd)
             return ConsoleResult(
                 stdout=output.output or "",
                 exit_ok=output.ok,
-                timestamp=time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                timestamp=timestamp,
             )
         except Exception as e:
             return ConsoleResult(
                 stdout=str(e),
                 exit_ok=False,
-                timestamp=time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                timestamp=timestamp,
             )
 
     def bootstrap_allowlist(self) -> dict:
@@ -633,11 +893,16 @@ class PrefectCore:
             self.settings.ollama_url = base_url.strip()
         if model is not None and model.strip():
             self.settings.model = model.strip()
+        old_client = self.__dict__.get("ollama")
         self.ollama = OllamaClient(OllamaConfig(base_url=self.settings.ollama_url, model=self.settings.model))
+        loop = self._aio_loop
+        if loop is not None and old_client is not None:
+            # Release the old client's pooled connections without waiting on them.
+            asyncio.run_coroutine_threadsafe(old_client.aclose(), loop)
 
     def list_ollama_models(self) -> dict:
         try:
-            models = asyncio.run(self.ollama.list_models())
+            models = self._run_coro(self.ollama.list_models())
             return {"ok": True, "models": models}
         except Exception as exc:
             return {"ok": False, "models": [], "error": str(exc)}
@@ -649,6 +914,12 @@ class PrefectCore:
         self._chat_thread = threading.Thread(target=self._chat_worker, name="prefect-chat-worker", daemon=True)
         self._chat_thread.start()
 
+    def _start_welcome_thread(self) -> None:
+        if self._welcome_thread and self._welcome_thread.is_alive():
+            return
+        self._welcome_thread = threading.Thread(target=self._welcome_worker, name="prefect-welcome", daemon=True)
+        self._welcome_thread.start()
+
     def _on_chat_mention(self, player: str, message: str) -> None:
         # Necesse chat mention (kept for backwards wiring)
         self._queue_chat_mention("necesse", player, message)
@@ -672,39 +943,122 @@ class PrefectCore:
                 self.log_buffer.append(
                     f"[Prefect] chat_event_queued server={server_kind} player={player} msg={message[:200]}"
                 )
-            self._chat_queue.put_nowait((server_kind, player, message))
+            self._chat_queue.append((server_kind, player, message))
+            self._chat_wakeup.set()
         except Exception:
             pass
 
-    def _chat_worker(self) -> None:
-        while not self._chat_stop.is_set():
+    def _drain_chat_batch(
+        self, first: tuple[Literal["necesse", "bedrock"], str, str]
+    ) -> list[tuple[Literal["necesse", "bedrock"], str, str]]:
+        """Collect mentions arriving shortly after `first`, keeping each player's latest."""
+        batch = {(first[0], first[1].lower()): first}
+        deadline = time.monotonic() + _CHAT_BATCH_WINDOW_SECONDS
+        while len(batch) < _CHAT_BATCH_MAX:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
             try:
-                server_kind, player, message = self._chat_queue.get(timeout=0.25)
-            except queue.Empty:
+                item = self._chat_queue.popleft()
+            except IndexError:
+                if not self._chat_wakeup.wait(remaining):
+                    break
+                self._chat_wakeup.clear()
                 continue
+            # Re-assigning an existing key keeps the player's original place in line.
+            batch[(item[0], item[1].lower())] = item
+        return list(batch.values())
 
-            now = time.time()
-            last_key = f"{server_kind}:{player.lower()}"
-            last = self._last_player_reply_ts.get(last_key, 0.0)
-            if now - last < float(self.settings.chat_cooldown_seconds):
-                continue
+    def _chat_worker(self) -> None:
+        while not self._chat_stop.is_set():
+            self._chat_wakeup.wait(timeout=0.25)
+            # Clear before draining: anything queued after this sets the event again.
+            self._chat_wakeup.clear()
+            while self._chat_queue and not self._chat_stop.is_set():
+                first = self._chat_queue.popleft()
+                self._handle_chat_batch(self._drain_chat_batch(first))
+
+    def _handle_chat_batch(self, batch: list[tuple[Literal["necesse", "bedrock"], str, str]]) -> None:
+        """Reply to a batch of mentions, generating the replies concurrently."""
+        if len(batch) == 1:
+            self._handle_chat_mention(*batch[0])
+            return
 
-            self._last_player_reply_ts[last_key] = now
+        jobs: list[_ReplyJob] = []
+        for server_kind, player, message in batch:
+            if not self._claim_reply(server_kind, player):
+                continue
+            try:
+                jobs.append(self._prepare_reply(server_kind, player, message))
+            except Exception as exc:
+                logger.warning("Chat responder failed: %s", exc)
+        if not jobs:
+            return
 
+        # One round trip on the shared loop; Ollama overlaps or queues the requests itself.
+        try:
+            replies = self._run_coro(_gather_settled([self._generate_reply(job) for job in jobs]))
+        except Exception as exc:
+            logger.warning("Ollama generate failed: %s", exc)
+            return
+        for job, reply in zip(jobs, replies):
+            if isinstance(reply, BaseException):
+                logger.warning("Ollama generate failed: %s", reply)
+                continue
             try:
-                self._respond_to_player(server_kind, player, message)
+                self._deliver_reply(job, reply)
             except Exception as exc:
                 logger.warning("Chat responder failed: %s", exc)
 
+    def _handle_chat_mention(self, server_kind: Literal["necesse", "bedrock"], player: str, message: str) -> None:
+        if not self._claim_reply(server_kind, player):
+            return
+
+        try:
+            self._respond_to_player(server_kind, player, message)
+        except Exception as exc:
+            logger.warning("Chat responder failed: %s", exc)
+
+    def _claim_reply(self, server_kind: Literal["necesse", "bedrock"], player: str) -> bool:
+        """Start the player's reply cooldown; False if they are still cooling down."""
+        now = time.time()
+        last_key = f"{server_kind}:{player.lower()}"
+        last = self._last_player_reply_ts.get(last_key, 0.0)
+        if now - last < self._chat_cooldown_s:
+            return False
+
+        replies = self._last_player_reply_ts
+        replies[last_key] = now
+        replies.move_to_end(last_key)
+        if len(replies) > _PLAYER_COOLDOWN_MAX:
+            replies.popitem(last=False)
+        # Oldest replies come first; once their cooldown has passed they no longer matter.
+        while replies:
+            oldest = next(iter(replies))
+            if now - replies[oldest] < self._chat_cooldown_s:
+                break
+            del replies[oldest]
+        return True
+
     def _respond_to_player(self, server_kind: Literal["necesse", "bedrock"], player: str, message: str) -> None:
-        keyword = (self.settings.chat_mention_keyword or "prefect").lower()
+        job = self._prepare_reply(server_kind, player, message)
+        try:
+            reply = self._run_coro(self._generate_reply(job))
+        except Exception as e:
+            logger.warning("Ollama generate failed: %s", e)
+            return
+        self._deliver_reply(job, reply)
+
+    def _prepare_reply(self, server_kind: Literal["necesse", "bedrock"], player: str, message: str) -> _ReplyJob:
+        """Record the player's message and build the prompt for the reply."""
         msg = message
         # If message starts with "prefect" style mention, strip it.
         lower = msg.lower().strip()
-        for prefix in (keyword + ":", "@" + keyword, keyword):
-            if lower.startswith(prefix):
-                msg = msg[len(prefix) :].lstrip(" :,-")
-                break
+        if lower.startswith(self._mention_prefixes):
+            for prefix in self._mention_prefixes:
+                if lower.startswith(prefix):
+                    msg = msg[len(prefix) :].lstrip(" :,-")
+                    break
 
         if server_kind == "bedrock":
             tracker = self.bedrock_player_tracker
@@ -730,30 +1084,23 @@ class PrefectCore:
             )
         
         # Build conversation context from persistent history
-        # Use session TTL for "recent" context, but also include older history
-        session_ttl = float(self.settings.chat_context_ttl_seconds)
-        recent_context = store.get_context_for_player(
-            player,
-            recent_count=int(self.settings.chat_context_turns),
-            session_ttl_seconds=session_ttl,
-        )
-        
-        # Also get some older history for longer-term context (if available)
-        full_history = store.get_context_for_player(
+        # Use session TTL for "recent" context, and note how much older history exists
+        context_turns = int(self.settings.chat_context_turns)
+        view = store.get_view(
             player,
-            recent_count=int(self.settings.chat_context_turns) * 2,
-            session_ttl_seconds=None,  # No TTL filter
+            recent_count=context_turns,
+            session_ttl_seconds=float(self.settings.chat_context_ttl_seconds),
         )
+        recent_context = view.context
+        total_messages = view.total_messages
         
         # If there's more history than recent session, mention it
         history_note = ""
-        conv_summary = store.get_player_summary(player)
-        if conv_summary["total_messages"] > int(self.settings.chat_context_turns):
-            history_note = f"(You have spoken with {player} {conv_summary['total_messages']} times before.)\n"
+        if total_messages > context_turns:
+            history_note = f"(You have spoken with {player} {total_messages} times before.)\n"
 
         # Get active persona for prompts and parameters
-        persona = self.persona_manager.get_active_persona()
-        system_prompt = persona.get_full_system_prompt()
+        persona, system_prompt = self._get_active_prompt()
         
         # Build prompt with player context and conversation history
         user_prompt = (
@@ -763,29 +1110,41 @@ class PrefectCore:
             f"Reply as Prefect to {player} in 1-2 sentences."
         ).strip()
 
-        # Call async Ollama from this thread with persona parameters.
-        params = persona.parameters
         if server_kind == "bedrock":
             self.bedrock_log_buffer.append(
-                f"[Prefect] generating_reply server={server_kind} player={player} persona={persona.name} history={conv_summary['total_messages']}"
+                f"[Prefect] generating_reply server={server_kind} player={player} persona={persona.name} history={total_messages}"
             )
         else:
             self.log_buffer.append(
-                f"[Prefect] generating_reply server={server_kind} player={player} persona={persona.name} history={conv_summary['total_messages']}"
+                f"[Prefect] generating_reply server={server_kind} player={player} persona={persona.name} history={total_messages}"
             )
-        try:
-            reply = asyncio.run(self.ollama.generate(
-                system_prompt, 
-                user_prompt,
-                temperature=params.temperature,
-                top_p=params.top_p,
-                top_k=params.top_k,
-                repeat_penalty=params.repeat_penalty,
-            ))
-        except Exception as e:
-            logger.warning("Ollama generate failed: %s", e)
-            return
+        return _ReplyJob(
+            server_kind=server_kind,
+            player=player,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            params=persona.parameters,
+            store=store,
+            announce_fn=announce_fn,
+            controller=controller,
+        )
+
+    async def _generate_reply(self, job: _ReplyJob) -> str:
+        # Call async Ollama with persona parameters.
+        params = job.params
+        return await self.ollama.generate(
+            job.system_prompt,
+            job.user_prompt,
+            temperature=params.temperature,
+            top_p=params.top_p,
+            top_k=params.top_k,
+            repeat_penalty=params.repeat_penalty,
+        )
 
+    def _deliver_reply(self, job: _ReplyJob, reply: str) -> None:
+        """Store the generated reply and post it to the player's server chat."""
+        server_kind, player = job.server_kind, job.player
+        store, announce_fn, controller = job.store, job.announce_fn, job.controller
         safe = _coerce_safe_chat_text(reply, max_len=int(self.settings.chat_max_reply_length))
         
         # Record Prefect's response in persistent conversation store
@@ -833,9 +1192,9 @@ class PrefectCore:
             # Use a short timeout to avoid blocking the UI thread for too long
             port_open = tcp_port_open(self.settings.game_host, self.settings.game_port, timeout_seconds=0.2)
         return {
-            **asdict(st),
+            **status_to_dict(st),
             "prefect_uptime_seconds": max(0.0, time.time() - self._start_time),
-            "log_buffer_lines": len(self.log_buffer.get_recent(self.settings.log_buffer_lines)),
+            "log_buffer_lines": len(self.log_buffer),
             "game_host": self.settings.game_host,
             "game_port": self.settings.game_port,
             "game_port_open": port_open,
@@ -863,9 +1222,9 @@ class PrefectCore:
         st = self.bedrock_controller.status()
         external = self._detect_external_bedrock()
         return {
-            **asdict(st),
+            **status_to_dict(st),
             "prefect_uptime_seconds": max(0.0, time.time() - self._start_time),
-            "log_buffer_lines": len(self.bedrock_log_buffer.get_recent(self.settings.log_buffer_lines)),
+            "log_buffer_lines": len(self.bedrock_log_buffer),
             "external_running": external["running"],
             "external_pids": external["pids"],
         }
@@ -953,22 +1312,24 @@ class PrefectCore:
         try:
             cmd = sanitize_command(command, max_length=self.settings.max_command_length)
             self.allowlist.require_allowed(cmd)
-
-            result = self.command_runner.run(cmd)
-            if result.ok:
-                return {"ok": True, "output": result.output}
-            # Hint if the server is likely running outside Prefect.
-            if not self.controller.status().running and self._detect_external_necesse()["running"]:
-                return {
-                    "ok": False,
-                    "error": (result.error or "Command failed")
-                    + " (server appears to be running outside Prefect; use control_mode=tmux to attach)",
-                    "output": result.output,
-                }
-            return {"ok": False, "error": result.error or "Command failed", "output": result.output}
-
         except (UnsafeInputError, CommandNotPermittedError) as exc:
             return {"ok": False, "error": str(exc), "output": ""}
+        return self._run_prevalidated(cmd)
+
+    def _run_prevalidated(self, cmd: str) -> dict:
+        """Run a command that has already passed sanitize_command() and the allowlist."""
+        result = self.command_runner.run(cmd)
+        if result.ok:
+            return {"ok": True, "output": result.output}
+        # Hint if the server is likely running outside Prefect.
+        if not self.controller.status().running and self._detect_external_necesse()["running"]:
+            return {
+                "ok": False,
+                "error": (result.error or "Command failed")
+                + " (server appears to be running outside Prefect; use control_mode=tmux to attach)",
+                "output": result.output,
+            }
+        return {"ok": False, "error": result.error or "Command failed", "output": result.output}
 
     def run_bedrock_command(self, command: str) -> dict:
         """Run a Bedrock console command (stdin to the server), returning a small log window."""
@@ -998,28 +1359,26 @@ class PrefectCore:
         except UnsafeInputError as exc:
             return {"ok": False, "sent": False, "error": str(exc)}
 
-        templates = [t.strip() for t in (self.settings.announce_command_templates or "").split(",") if t.strip()]
-        if not templates:
-            templates = ["say {message}"]
+        templates = self._announce_templates
 
         last_err: str | None = None
         last_out: str | None = None
 
-        for tmpl in templates:
-            cmd = tmpl.replace("{message}", msg)
-            resp = self.run_command(cmd)
+        for tmpl, parts in zip(templates, self._announce_parts):
+            if parts is not None and len(parts[0]) + len(msg) + len(parts[1]) <= self.settings.max_command_length:
+                resp = self._run_prevalidated(parts[0] + msg + parts[1])
+            else:
+                resp = self.run_command(tmpl.replace("{message}", msg))
             last_out = resp.get("output", "")
             if resp.get("ok") and not _looks_like_unknown_command(last_out):
                 # Emit a local chat event so UI can show server messages even if the server doesn't echo them.
                 self._on_chat_line("Server", msg)
 
                 # Check if this announcement should trigger the AI (as if "Admin" said it)
-                if self.settings.chat_mention_enabled:
-                    keyword = (self.settings.chat_mention_keyword or "prefect").lower()
-                    # Relaxed check: trigger if keyword is anywhere in the message
-                    if keyword in msg.lower():
-                        logger.debug("Triggering AI for announced message: %s", msg)
-                        self._on_chat_mention("Admin", msg)
+                # Relaxed check: trigger if keyword is anywhere in the message
+                if self._mention_re is not None and self._mention_re.search(msg):
+                    logger.debug("Triggering AI for announced message: %s", msg)
+                    self._on_chat_mention("Admin", msg)
 
                 return {"ok": True, "sent": True}
             last_err = resp.get("error") or last_err
@@ -1034,11 +1393,7 @@ class PrefectCore:
         except UnsafeInputError as exc:
             return {"ok": False, "sent": False, "error": str(exc)}
 
-        templates = [
-            t.strip() for t in (self.settings.bedrock_announce_command_templates or "").split(",") if t.strip()
-        ]
-        if not templates:
-            templates = ["say {message}"]
+        templates = self._bedrock_announce_templates
 
         last_err: str | None = None
         last_out: str | None = None
@@ -1079,12 +1434,10 @@ class PrefectCore:
         self._on_chat_line(origin, msg)
 
         # Check for AI trigger
-        if self.settings.chat_mention_enabled:
-            keyword = (self.settings.chat_mention_keyword or "prefect").lower()
-            # Relaxed check: trigger if keyword is anywhere in the message
-            if keyword in msg.lower():
-                logger.debug("Triggering AI for local message: %s", msg)
-                self._on_chat_mention(origin, msg)
+        # Relaxed check: trigger if keyword is anywhere in the message
+        if self._mention_re is not None and self._mention_re.search(msg):
+            logger.debug("Triggering AI for local message: %s", msg)
+            self._on_chat_mention(origin, msg)
 
         return {"ok": True, "sent": True, "local_only": True}
 
@@ -1105,19 +1458,17 @@ class PrefectCore:
         Since exact Necesse messages vary, we look for common markers.
         """
 
-        start = time.time()
-        patterns = (
-            "server started",
-            "listening",
-            "done",
-            "loaded",
-            "world",
-        )
-        while time.time() - start < timeout_seconds:
-            recent = "\n".join(self.get_recent_logs(200)).lower()
-            if any(p in recent for p in patterns):
+        buf = self.log_buffer
+        deadline = time.monotonic() + timeout_seconds
+        # Check the last 200 lines of backlog first, then wake up for each new line.
+        seen = max(buf.total_appended() - 200, 0)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            seen, lines = buf.wait_for_lines(seen, timeout=remaining)
+            if any(_READY_RE.search(line) for line in lines):
                 return {"ok": True, "ready": True}
-            time.sleep(0.5)
         return {"ok": True, "ready": False, "error": "Timed out waiting for ready markers in logs"}
 
     async def summarize_recent_logs(self, n: int = 50) -> dict:
@@ -1131,14 +1482,15 @@ class PrefectCore:
         params = persona.parameters
 
         try:
-            text = await self.ollama.generate(
+            # Runs on the background loop, which owns the Ollama connection pool.
+            text = await asyncio.wrap_future(self._submit_coro(self.ollama.generate(
                 system_prompt, 
                 user_prompt,
                 temperature=params.temperature,
                 top_p=params.top_p,
                 top_k=params.top_k,
                 repeat_penalty=params.repeat_penalty,
-            )
+            )))
             return {"ok": True, "summary": text.strip()}
         except Exception as exc:
             return {"ok": False, "error": str(exc), "summary": ""}
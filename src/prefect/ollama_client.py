@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import json
 import logging
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, AsyncIterator
 
 import httpx
 
@@ -25,6 +26,53 @@ class OllamaClient:
     def __init__(self, config: OllamaConfig, *, timeout_seconds: float = 30.0):
         self._config = config
         self._timeout = httpx.Timeout(timeout_seconds)
+        # Connection pool reused across requests made from the same event loop.
+        self._shared: httpx.AsyncClient | None = None
+        self._shared_loop: asyncio.AbstractEventLoop | None = None
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self._config.base_url,
+            timeout=self._timeout,
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+
+    @contextlib.asynccontextmanager
+    async def _client(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the shared client, or a one-off client when called from another loop.
+
+        An httpx.AsyncClient is bound to the loop it first ran on, so the pool is
+        kept for whichever loop claims it first (normally PrefectCore's background
+        loop) and requests from any other loop get a short-lived client.
+        """
+        loop = asyncio.get_running_loop()
+        if self._shared_loop is None or self._shared_loop.is_closed():
+            stale, self._shared = self._shared, self._new_client()
+            self._shared_loop = loop
+            if stale is not None:
+                # Its loop is gone, so this mostly just drops the dead connections.
+                try:
+                    await stale.aclose()
+                except Exception as exc:
+                    logger.debug("Failed to close stale Ollama client: %s", exc)
+        if self._shared is not None and self._shared_loop is loop:
+            yield self._shared
+            return
+        async with self._new_client() as client:
+            yield client
+
+    async def aclose(self) -> None:
+        """Close the shared connection pool.
+
+        Only the loop the pool is bound to can close it; from any other loop
+        this does nothing.
+        """
+        if self._shared_loop is not asyncio.get_running_loop():
+            return
+        client, self._shared = self._shared, None
+        self._shared_loop = None
+        if client is not None:
+            await client.aclose()
 
     async def generate(
         self,
@@ -79,7 +127,7 @@ class OllamaClient:
                     attempt,
                 )
 
-                async with httpx.AsyncClient(base_url=self._config.base_url, timeout=self._timeout) as client:
+                async with self._client() as client:
                     try:
                         resp = await client.post("/api/generate", json=payload)
                         resp.raise_for_status()
@@ -155,7 +203,7 @@ class OllamaClient:
         while attempt <= retries:
             attempt += 1
             try:
-                async with httpx.AsyncClient(base_url=self._config.base_url, timeout=self._timeout) as client:
+                async with self._client() as client:
                     try:
                         resp = await client.get("/api/tags")
                         resp.raise_for_status()
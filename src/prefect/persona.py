@@ -157,7 +157,7 @@ class PersonaManager:
         }
         try:
             with open(self._storage_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+                f.write(json.dumps(data, indent=2))
         except Exception as e:
             logger.error("Failed to save personas: %s", e)
     
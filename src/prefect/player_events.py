@@ -97,7 +97,7 @@ class PlayerTracker:
         
         try:
             with open(self._storage_path, "w") as f:
-                json.dump(data, f, indent=2)
+                f.write(json.dumps(data, indent=2))
             logger.debug("Saved %d player records to %s", len(self._players), self._storage_path)
         except Exception as e:
             logger.error("Failed to save player records: %s", e)
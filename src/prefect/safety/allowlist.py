@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 class CommandNotPermittedError(PermissionError):
@@ -16,6 +16,13 @@ class CommandAllowlist:
     """
 
     prefixes: tuple[str, ...]
+    # Lookup index: the prefixes as a set, plus each distinct prefix length.
+    _prefix_set: frozenset[str] = field(init=False, repr=False, compare=False)
+    _prefix_lengths: tuple[int, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_prefix_set", frozenset(self.prefixes))
+        object.__setattr__(self, "_prefix_lengths", tuple(sorted({len(p) for p in self.prefixes})))
 
     @staticmethod
     def default(*, extra_prefixes: tuple[str, ...] = ()) -> "CommandAllowlist":
@@ -38,7 +45,11 @@ class CommandAllowlist:
         normalized = command.lstrip()
         if not normalized:
             return False
-        return any(normalized == p or normalized.startswith(p) for p in self.prefixes)
+        # A command starts with some prefix p exactly when its first len(p)
+        # characters are in the set, so check one slice per distinct length
+        # instead of scanning every prefix.
+        prefix_set = self._prefix_set
+        return any(normalized[:n] in prefix_set for n in self._prefix_lengths)
 
     def require_allowed(self, command: str) -> None:
         if not self.is_allowed(command):
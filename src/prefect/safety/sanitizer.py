@@ -6,13 +6,13 @@ class UnsafeInputError(ValueError):
 
 
 # Explicitly disallow common shell chaining / expansion / redirection characters.
-_DISALLOWED_CHARS = set(";|&><$(){}[]`\\")
+_DISALLOWED_CHARS = frozenset(";|&><$(){}[]`\\")
 
 
 def _check_common(value: str) -> None:
     if "\n" in value or "\r" in value:
         raise UnsafeInputError("Newlines are not permitted")
-    if any(ch in _DISALLOWED_CHARS for ch in value):
+    if not _DISALLOWED_CHARS.isdisjoint(value):
         raise UnsafeInputError("Disallowed characters detected")
 
 
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import subprocess
 import time
-from dataclasses import asdict
 from pathlib import Path
 import shutil
 from typing import Protocol
@@ -151,4 +150,13 @@ class TmuxAttachController(ServerController):
 
 
 def status_to_dict(status: ServerStatus) -> dict:
-    return asdict(status)
+    # Built directly rather than with asdict(), which deep-copies every field;
+    # status is polled on every UI refresh.
+    return {
+        "running": status.running,
+        "pid": status.pid,
+        "uptime_seconds": status.uptime_seconds,
+        "last_error": status.last_error,
+        "last_restart_time": status.last_restart_time,
+        "players_online": list(status.players_online),
+    }
@@ -269,7 +269,7 @@ class MainWindow(QtWidgets.QMainWindow):
                         "Bedrock Updated",
                         "Update complete.\n\n"
                         f"Download: {resp.get('download_url', 'unknown')}\n"
-                        f"Backup: {resp.get('backup_dir', 'unknown')}",
+                        f"Backup: {resp.get('backup_dir') or 'none (already up to date)'}",
                     )
                 else:
                     QtWidgets.QMessageBox.warning(
@@ -930,5 +930,6 @@ class MainWindow(QtWidgets.QMainWindow):
 def main() -> None:
     app = QtWidgets.QApplication(sys.argv)
     w = MainWindow()
+    app.aboutToQuit.connect(w.core.shutdown)
     w.show()
     sys.exit(app.exec())
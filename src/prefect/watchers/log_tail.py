@@ -4,6 +4,7 @@ import re
 import threading
 import time
 from collections import deque
+from itertools import islice
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Deque, Iterable, Pattern
@@ -19,14 +20,22 @@ class RollingLogBuffer:
     def __init__(self, *, max_lines: int = 2000):
         self._lines: Deque[LogLine] = deque(maxlen=max_lines)
         self._lock = threading.Lock()
+        # Running count of lines ever appended; waiters are woken on each append.
+        self._total = 0
+        self._appended = threading.Condition(self._lock)
+
+    def __len__(self) -> int:
+        return len(self._lines)
 
     def append(self, line: str) -> None:
         line = line.rstrip("\n")
         if not line:
             return
-        entry = LogLine(ts=time.time(), line=line)
         with self._lock:
-            self._lines.append(entry)
+            # Stamped under the lock so entries stay in timestamp order (get_since relies on it).
+            self._lines.append(LogLine(ts=time.time(), line=line))
+            self._total += 1
+            self._appended.notify_all()
 
     def extend(self, lines: Iterable[str]) -> None:
         for line in lines:
@@ -35,16 +44,52 @@ class RollingLogBuffer:
     def get_recent(self, n: int) -> list[str]:
         if n <= 0:
             return []
+        # Copy only the entries needed while holding the lock; build the result after.
         with self._lock:
-            return [e.line for e in list(self._lines)[-n:]]
+            entries = list(islice(reversed(self._lines), n))
+        entries.reverse()
+        return [e.line for e in entries]
+
+    def _newest_since(self, ts: float) -> list[LogLine]:
+        """Entries with e.ts >= ts, newest first. Caller holds the lock."""
+        # Timestamps are in order, so stop at the first older entry.
+        newer: list[LogLine] = []
+        for entry in reversed(self._lines):
+            if entry.ts < ts:
+                break
+            newer.append(entry)
+        return newer
 
     def get_since(self, ts: float) -> list[str]:
         with self._lock:
-            return [e.line for e in self._lines if e.ts >= ts]
+            entries = self._newest_since(ts)
+        entries.reverse()
+        return [e.line for e in entries]
 
     def get_since_with_ts(self, ts: float) -> list[tuple[float, str]]:
         with self._lock:
-            return [(e.ts, e.line) for e in self._lines if e.ts >= ts]
+            entries = self._newest_since(ts)
+        entries.reverse()
+        return [(e.ts, e.line) for e in entries]
+
+    def total_appended(self) -> int:
+        """Number of lines appended since creation, including ones since evicted."""
+        with self._lock:
+            return self._total
+
+    def wait_for_lines(self, seen: int, *, timeout: float) -> tuple[int, list[str]]:
+        """Wait up to timeout for lines beyond the first `seen` ever appended.
+
+        Returns the new total_appended() and the lines after `seen` that are
+        still buffered, oldest first (empty on timeout).
+        """
+        with self._appended:
+            self._appended.wait_for(lambda: self._total > seen, timeout)
+            new = min(self._total - seen, len(self._lines))
+            lines = [e.line for e in islice(reversed(self._lines), max(new, 0))]
+            total = self._total
+        lines.reverse()
+        return total, lines
 
     def search(self, pattern: str, *, n: int = 50, flags: int = re.IGNORECASE) -> list[str]:
         if n <= 0:
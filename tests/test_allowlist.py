@@ -86,6 +86,13 @@ class TestCommandAllowlist:
         # "saying" doesn't start with "say "
         assert not allowlist.is_allowed("saying")
 
+    def test_prefixes_of_different_lengths(self):
+        allowlist = CommandAllowlist(prefixes=("p", "players", "time "))
+        assert allowlist.is_allowed("pl")
+        assert allowlist.is_allowed("time set")
+        assert not allowlist.is_allowed("tim")
+        assert not allowlist.is_allowed("time")
+
     def test_deduplication(self):
         allowlist = CommandAllowlist.default(extra_prefixes=("help", "help"))
         # Should not error, duplicates are removed
@@ -0,0 +1,201 @@
+"""Tests for prefect.bedrock_updater module."""
+from __future__ import annotations
+
+import asyncio
+import functools
+import shutil
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+import httpx
+import pytest
+
+from prefect import bedrock_updater
+from prefect.bedrock_updater import update_bedrock_server_in_place
+
+
+def _make_zip(path: Path, files: dict[str, str]) -> Path:
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, text in files.items():
+            zf.writestr(name, text)
+    return path
+
+
+_PAYLOAD = bytes(range(256)) * 40
+
+
+def _range_server(payload: bytes = _PAYLOAD, *, ranges: bool = True, short: bool = False):
+    """MockTransport handler serving payload, optionally honouring Range requests."""
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "HEAD":
+            headers = {"Content-Length": str(len(payload))}
+            if ranges:
+                headers["Accept-Ranges"] = "bytes"
+            return httpx.Response(200, headers=headers)
+        spec = request.headers.get("Range")
+        if not ranges or spec is None:
+            return httpx.Response(200, content=payload)
+        start, end = (int(x) for x in spec.removeprefix("bytes=").split("-"))
+        body = payload[start : end + 1]
+        if short:
+            body = body[:-1]
+        return httpx.Response(206, content=body)
+    
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+def server_root(temp_dir: Path) -> Path:
+    root = temp_dir / "bds"
+    root.mkdir()
+    (root / "bedrock_server").write_text("old binary")
+    (root / "server.properties").write_text("level-name=mine")
+    return root
+
+
+class TestUpdateBedrockServerInPlace:
+    """Tests for installing a downloaded server zip."""
+
+    def _install(self, root: Path, zip_path: Path):
+        def _fake_download(url, dst, log):
+            shutil.copyfile(zip_path, dst)
+        
+        with mock.patch.object(bedrock_updater, "_download", _fake_download):
+            return update_bedrock_server_in_place(server_root=root, download_url="https://example.test/bds.zip")
+
+    def test_installs_and_backs_up(self, server_root: Path, temp_dir: Path):
+        zip_path = _make_zip(temp_dir / "bds.zip", {
+            "bedrock_server": "new binary",
+            "server.properties": "level-name=default",
+            "behavior_packs/vanilla/manifest.json": "{}",
+        })
+        
+        result = self._install(server_root, zip_path)
+        
+        assert (server_root / "bedrock_server").read_text() == "new binary"
+        assert (server_root / "server.properties").read_text() == "level-name=mine"  # preserved
+        assert (server_root / "behavior_packs" / "vanilla" / "manifest.json").exists()
+        assert result.backup_dir is not None
+        assert (result.backup_dir / "bedrock_server").read_text() == "old binary"
+
+    def test_same_zip_skips_install(self, server_root: Path, temp_dir: Path):
+        zip_path = _make_zip(temp_dir / "bds.zip", {"bedrock_server": "new binary"})
+        self._install(server_root, zip_path)
+        (server_root / "bedrock_server").write_text("touched")
+        
+        result = self._install(server_root, zip_path)
+        
+        assert result.backup_dir is None
+        assert (server_root / "bedrock_server").read_text() == "touched"
+
+
+class TestIterBedrockUrlMatches:
+    """Tests for the windowed download-page URL scan."""
+
+    def _best(self, html: str) -> str | None:
+        best, best_rank = None, 3
+        for m in bedrock_updater._iter_bedrock_url_matches(html):
+            rank = bedrock_updater._rank_bedrock_url(m)
+            if rank < best_rank:
+                best, best_rank = m.group(0), rank
+        return best
+
+    def test_matches_page_order(self):
+        html = (
+            '<a href="https://example.com/bin-linux/bedrock-server-1.0.zip">a</a>'
+            + "x" * 5000
+            + '<a href="https://minecraft.azureedge.net/bin-linux/bedrock-server-1.1.zip">b</a>'
+        )
+        
+        urls = [m.group(0) for m in bedrock_updater._iter_bedrock_url_matches(html)]
+        
+        assert urls == [
+            "https://example.com/bin-linux/bedrock-server-1.0.zip",
+            "https://minecraft.azureedge.net/bin-linux/bedrock-server-1.1.zip",
+        ]
+
+    def test_upper_case_preferred_link_not_skipped(self):
+        html = (
+            '<a href="https://cdn.example.com/bin-linux/bedrock-server-1.0.zip">generic</a>'
+            '<a href="https://www.minecraft.net/bedrockdedicatedserver/BIN-LINUX/bedrock-server-1.2.zip">mc</a>'
+        )
+        
+        assert self._best(html) == "https://www.minecraft.net/bedrockdedicatedserver/BIN-LINUX/bedrock-server-1.2.zip"
+
+    def test_no_links(self):
+        assert list(bedrock_updater._iter_bedrock_url_matches("<html>nothing here</html>")) == []
+
+
+class TestDownload:
+    """Tests for the ranged download and its single-stream fallback."""
+
+    URL = "https://example.test/bds.zip"
+
+    def _download(self, dst: Path, transport: httpx.MockTransport) -> tuple[list[str], mock.Mock]:
+        logs: list[str] = []
+        ranged = functools.partial(bedrock_updater._download_ranged, num_chunks=4, transport=transport)
+        with mock.patch.object(bedrock_updater, "_download_ranged", ranged), mock.patch.object(
+            bedrock_updater, "_download_single"
+        ) as single:
+            bedrock_updater._download(self.URL, dst, logs.append)
+        return logs, single
+
+    def test_ranged_download_writes_all_parts(self, temp_dir: Path):
+        dst = temp_dir / "bds.zip"
+        
+        asyncio.run(bedrock_updater._download_ranged(self.URL, dst, num_chunks=3, transport=_range_server()))
+        
+        assert dst.read_bytes() == _PAYLOAD
+
+    def test_ranged_download_does_not_fall_back(self, temp_dir: Path):
+        dst = temp_dir / "bds.zip"
+        
+        logs, single = self._download(dst, _range_server())
+        
+        assert dst.read_bytes() == _PAYLOAD
+        assert logs == []
+        single.assert_not_called()
+
+    def test_no_range_support_falls_back(self, temp_dir: Path):
+        logs, single = self._download(temp_dir / "bds.zip", _range_server(ranges=False))
+        
+        single.assert_called_once_with(self.URL, temp_dir / "bds.zip")
+        assert logs == ["[BDS:UPDATE] server does not support ranged download; using a single stream"]
+
+    def test_range_ignored_inside_task_group_falls_back(self, temp_dir: Path):
+        # HEAD advertises ranges but GETs answer 200: raised from the TaskGroup.
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "HEAD":
+                return httpx.Response(200, headers={"Content-Length": str(len(_PAYLOAD)), "Accept-Ranges": "bytes"})
+            return httpx.Response(200, content=_PAYLOAD)
+        
+        logs, single = self._download(temp_dir / "bds.zip", httpx.MockTransport(handler))
+        
+        single.assert_called_once()
+        assert logs == ["[BDS:UPDATE] server does not support ranged download; using a single stream"]
+
+    def test_short_read_falls_back(self, temp_dir: Path):
+        logs, single = self._download(temp_dir / "bds.zip", _range_server(short=True))
+        
+        single.assert_called_once()
+        assert len(logs) == 1
+        assert "ranged download failed" in logs[0]
+        assert "Short read" in logs[0]
+
+    def test_running_loop_uses_single_stream(self, temp_dir: Path):
+        logs: list[str] = []
+        
+        async def _in_loop():
+            with mock.patch.object(bedrock_updater, "_download_ranged") as ranged, mock.patch.object(
+                bedrock_updater, "_download_single"
+            ) as single:
+                bedrock_updater._download(self.URL, temp_dir / "bds.zip", logs.append)
+            return ranged, single
+        
+        ranged, single = asyncio.run(_in_loop())
+        
+        ranged.assert_not_called()
+        single.assert_called_once_with(self.URL, temp_dir / "bds.zip")
+        assert logs == ["[BDS:UPDATE] called from a running event loop; using a single stream"]
@@ -55,6 +55,21 @@ class TestCommandParameter:
         assert schema["enum"] == ["start", "stop", "clear"]
         assert "options:" in schema["description"]
 
+    def test_to_schema_returns_independent_dict(self):
+        param = CommandParameter(name="action", required=True, choices=["start", "stop"])
+        schema = param.to_schema()
+        schema["type"] = "integer"
+        schema["enum"].append("clear")
+        
+        fresh = param.to_schema()
+        
+        assert fresh == {"type": "string", "description": fresh["description"], "enum": ["start", "stop"]}
+        assert json.loads(json.dumps(fresh))["enum"] == ["start", "stop"]
+
+    def test_choices_stored_as_tuple(self):
+        param = CommandParameter(name="action", required=True, choices=["start", "stop"])
+        assert param.choices == ("start", "stop")
+
 
 class TestParseCommandSyntax:
     """Tests for syntax parsing."""
@@ -80,7 +95,7 @@ class TestParseCommandSyntax:
         assert len(params) == 1
         assert params[0].name == "page/command"
         assert params[0].required is False
-        assert params[0].choices == ["page", "command"]
+        assert params[0].choices == ("page", "command")
 
     def test_mixed_params(self):
         params = parse_command_syntax("buff [<player>] <buff> [<seconds>]")
@@ -95,7 +110,7 @@ class TestParseCommandSyntax:
     def test_choices_extracted(self):
         params = parse_command_syntax("rain <start/clear>")
         assert len(params) == 1
-        assert params[0].choices == ["start", "clear"]
+        assert params[0].choices == ("start", "clear")
 
     def test_complex_syntax(self):
         # Note: Deeply nested optional params are a known limitation
@@ -107,7 +122,7 @@ class TestParseCommandSyntax:
         assert len(params) >= 1
         assert params[0].name == "list/set/get"
         assert params[0].required is True
-        assert params[0].choices == ["list", "set", "get"]
+        assert params[0].choices == ("list", "set", "get")
 
     def test_nested_optional_params(self):
         # Nested brackets are tricky - we extract what we can
@@ -198,6 +213,22 @@ class TestCommandToolDefinition:
         assert "seconds" in schema["properties"]
         assert schema["required"] == ["buff"]
 
+    def test_to_tool_schema_returns_independent_dict(self):
+        tool = CommandToolDefinition(
+            command_name="weather", syntax="weather <start/stop>", description="",
+            parameters=parse_command_syntax("weather <start/stop>"),
+        )
+        schema = tool.to_tool_schema()
+        schema["required"].clear()
+        schema["properties"]["start_or_stop"]["enum"].append("clear")
+        
+        fresh = tool.to_tool_schema()
+        
+        assert fresh is not schema
+        assert fresh["required"] == ["start_or_stop"]
+        assert fresh["properties"]["start_or_stop"]["enum"] == ["start", "stop"]
+        assert json.loads(json.dumps(fresh)) == fresh
+
     def test_build_command_string_simple(self):
         tool = CommandToolDefinition(
             command_name="ban",
@@ -347,6 +378,21 @@ class TestCommandToolRegistry:
         assert len(safe) == 1
         assert safe[0].command_name == "help"
 
+    def test_reregister_updates_indexes(self):
+        registry = CommandToolRegistry()
+        registry.register(CommandToolDefinition(
+            command_name="help", syntax="help", description="",
+            category="info", risk_level="safe",
+        ))
+        registry.register(CommandToolDefinition(
+            command_name="help", syntax="help", description="",
+            category="admin", risk_level="moderate",
+        ))
+        
+        assert registry.get_by_category("info") == []
+        assert [t.category for t in registry.get_by_category("admin")] == ["admin"]
+        assert registry.get_safe_tools() == []
+
     def test_len(self):
         registry = CommandToolRegistry()
         assert len(registry) == 0
@@ -438,6 +484,21 @@ class TestLoadToolsFromSnapshot:
 class TestToolDescriptionsForLLM:
     """Tests for LLM-readable tool descriptions."""
 
+    def test_cached_until_register(self):
+        registry = CommandToolRegistry()
+        registry.register(CommandToolDefinition(
+            command_name="help", syntax="help", description="", category="info",
+        ))
+        
+        first = get_tool_descriptions_for_llm(registry)
+        assert get_tool_descriptions_for_llm(registry) is first
+        assert registry.describe_for_llm() is first
+        
+        registry.register(CommandToolDefinition(
+            command_name="ban", syntax="ban <player>", description="", category="moderation",
+        ))
+        assert "**ban**" in get_tool_descriptions_for_llm(registry)
+
     def test_generates_markdown(self):
         registry = CommandToolRegistry()
         registry.register(CommandToolDefinition(
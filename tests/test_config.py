@@ -7,7 +7,7 @@ from unittest import mock
 
 import pytest
 
-from prefect.config import PrefectSettings, get_settings
+from prefect.config import PrefectSettings, get_settings, reset_settings
 
 
 class TestPrefectSettings:
@@ -64,9 +64,16 @@ class TestGetSettings:
         settings = get_settings()
         assert isinstance(settings, PrefectSettings)
 
-    def test_creates_new_instance_each_call(self):
-        """Document current behavior: each call creates new instance."""
+    def test_returns_cached_instance(self):
         s1 = get_settings()
         s2 = get_settings()
-        # Currently creates new instances
-        assert s1 is not s2
+        assert s1 is s2
+
+    def test_reset_settings_rereads_environment(self):
+        get_settings()
+        with mock.patch.dict(os.environ, {"PREFECT_MODEL": "reset-model"}):
+            reset_settings()
+            try:
+                assert get_settings().model == "reset-model"
+            finally:
+                reset_settings()
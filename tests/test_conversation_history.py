@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import json
 import time
+from datetime import datetime
 from pathlib import Path
 
 import pytest
@@ -167,6 +168,7 @@ class TestConversationHistoryStore:
         store1 = ConversationHistoryStore(storage_path=storage_path)
         store1.add_player_message("TestPlayer", "Hello")
         store1.add_prefect_response("TestPlayer", "Response")
+        store1.flush()
         
         # Create new store instance (simulating restart)
         store2 = ConversationHistoryStore(storage_path=storage_path)
@@ -176,6 +178,123 @@ class TestConversationHistoryStore:
         assert conv.messages[0].content == "Hello"
         assert conv.messages[1].content == "Response"
     
+    def test_messages_are_appended_to_log(self, tmp_path):
+        storage_path = tmp_path / "conversations.json"
+        store = ConversationHistoryStore(storage_path=storage_path, save_delay_seconds=60)
+        
+        for i in range(5):
+            store.add_player_message("TestPlayer", f"Message {i}")
+        
+        # Only the append-only log is written until compaction
+        assert not storage_path.exists()
+        lines = (tmp_path / "conversations.jsonl").read_text().splitlines()
+        assert len(lines) == 6
+        assert json.loads(lines[0])["op"] == "log"
+        assert json.loads(lines[1])["content"] == "Message 0"
+        
+        store.flush()
+        data = json.loads(storage_path.read_text())
+        assert len(data["conversations"]["testplayer"]["messages"]) == 5
+        assert (tmp_path / "conversations.jsonl").read_text() == ""
+        assert not list(tmp_path.glob("*.tmp"))
+    
+    def test_log_replayed_on_load(self, tmp_path):
+        storage_path = tmp_path / "conversations.json"
+        store1 = ConversationHistoryStore(storage_path=storage_path)
+        store1.add_player_message("TestPlayer", "Hello")
+        store1.flush()
+        store1.add_prefect_response("TestPlayer", "Response")
+        store1.add_player_message("Other", "Hi")
+        store1.clear_player_history("Other")
+        
+        store2 = ConversationHistoryStore(storage_path=storage_path)
+        
+        conv = store2.get_conversation("TestPlayer")
+        assert conv.total_messages == 2
+        assert conv.messages[1].content == "Response"
+        assert store2.get_all_players() == ["TestPlayer"]
+    
+    def test_crash_before_log_truncation_does_not_duplicate(self, tmp_path):
+        storage_path = tmp_path / "conversations.json"
+        log_path = tmp_path / "conversations.jsonl"
+        store1 = ConversationHistoryStore(storage_path=storage_path)
+        store1.add_player_message("TestPlayer", "hi")
+        store1.add_prefect_response("TestPlayer", "yo")
+        uncompacted = log_path.read_bytes()
+        store1.flush()
+        # As if the process died after writing the snapshot but before truncating the log.
+        log_path.write_bytes(uncompacted)
+        
+        store2 = ConversationHistoryStore(storage_path=storage_path)
+        conv = store2.get_conversation("TestPlayer")
+        assert [m.content for m in conv.messages] == ["hi", "yo"]
+        assert conv.total_messages == 2
+        
+        store2.add_player_message("TestPlayer", "again")
+        store3 = ConversationHistoryStore(storage_path=storage_path)
+        conv = store3.get_conversation("TestPlayer")
+        assert [m.content for m in conv.messages] == ["hi", "yo", "again"]
+        assert conv.total_messages == 3
+    
+    def test_log_compacted_when_large(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(ConversationHistoryStore, "_MIN_COMPACT_BYTES", 0)
+        storage_path = tmp_path / "conversations.json"
+        store = ConversationHistoryStore(storage_path=storage_path, save_delay_seconds=0.01)
+        store.add_player_message("TestPlayer", "Hello")
+        
+        deadline = time.time() + 2.0
+        while not storage_path.exists() and time.time() < deadline:
+            time.sleep(0.01)
+        
+        assert storage_path.exists()
+        store.flush()
+        assert (tmp_path / "conversations.jsonl").read_text() == ""
+    
+    def test_history_loaded_lazily(self, tmp_path):
+        storage_path = tmp_path / "conversations.json"
+        store1 = ConversationHistoryStore(storage_path=storage_path)
+        store1.add_player_message("TestPlayer", "Hello")
+        store1.flush()
+        
+        store2 = ConversationHistoryStore(storage_path=storage_path)
+        store2.add_player_message("Other", "Hi")
+        assert not store2._loaded
+        
+        assert sorted(store2.get_all_players()) == ["Other", "TestPlayer"]
+        assert store2.get_conversation("Other").total_messages == 1
+    
+    def test_add_before_first_read(self, tmp_path):
+        storage_path = tmp_path / "conversations.json"
+        store1 = ConversationHistoryStore(storage_path=storage_path)
+        store1.add_player_message("TestPlayer", "Hello")
+        store1.flush()
+        
+        store2 = ConversationHistoryStore(storage_path=storage_path)
+        message = store2.add_prefect_response("TestPlayer", "Welcome back")
+        
+        assert message.content == "Welcome back"
+        conv = store2.get_conversation("TestPlayer")
+        assert conv.total_messages == 2
+        assert conv.messages[-1] == message
+    
+    def test_unlogged_message_kept_on_load(self, tmp_path, monkeypatch):
+        storage_path = tmp_path / "conversations.json"
+        store = ConversationHistoryStore(storage_path=storage_path)
+        monkeypatch.setattr(store, "_append_record", lambda record: False)
+        
+        store.add_player_message("TestPlayer", "Hello")
+        
+        assert [m.content for m in store.get_conversation("TestPlayer").messages] == ["Hello"]
+    
+    def test_in_memory_store(self, tmp_path):
+        storage_path = tmp_path / "conversations.json"
+        store = ConversationHistoryStore(storage_path=storage_path, persist=False)
+        store.add_player_message("TestPlayer", "Hello")
+        store.flush()
+        
+        assert store.get_conversation("TestPlayer").total_messages == 1
+        assert list(tmp_path.iterdir()) == []
+    
     def test_get_context_for_player(self, store):
         store.add_player_message("TestPlayer", "Hello")
         store.add_prefect_response("TestPlayer", "Greetings.")
@@ -186,6 +305,16 @@ class TestConversationHistoryStore:
         assert "Prefect: Greetings." in context
         assert "Player: Who are you?" in context
     
+    def test_get_view(self, store):
+        store.add_player_message("TestPlayer", "Hello")
+        store.add_prefect_response("TestPlayer", "Greetings.")
+        store.add_player_message("TestPlayer", "Who are you?")
+        
+        view = store.get_view("TestPlayer", recent_count=2, session_ttl_seconds=60)
+        assert view.context == store.get_context_for_player("TestPlayer", recent_count=2, session_ttl_seconds=60)
+        assert view.context == "Prefect: Greetings.\nPlayer: Who are you?"
+        assert view.total_messages == 3
+    
     def test_get_player_summary(self, store):
         store.add_player_message("TestPlayer", "Hello")
         store.add_prefect_response("TestPlayer", "Greetings.")
@@ -195,6 +324,18 @@ class TestConversationHistoryStore:
         assert summary["total_messages"] == 2
         assert summary["stored_messages"] == 2
     
+    def test_get_player_summary_times_are_isoformat(self, store):
+        store.add_player_message("TestPlayer", "Hello")
+        conv = store.get_conversation("TestPlayer")
+        conv.first_interaction = conv.last_interaction = 1700000000.25
+        
+        summary = store.get_player_summary("TestPlayer")
+        
+        expected = datetime.fromtimestamp(1700000000.25).isoformat()
+        assert summary["first_interaction"] == expected
+        assert summary["last_interaction"] == expected
+        assert expected.endswith(".250000")
+    
     def test_prune_old_messages(self, tmp_path):
         store = ConversationHistoryStore(
             storage_path=tmp_path / "conversations.json",
@@ -212,6 +353,18 @@ class TestConversationHistoryStore:
         assert conv.messages[0].content == "Message 2"
         assert conv.messages[2].content == "Message 4"
     
+    def test_prune_expired_messages(self, store):
+        conv = store.get_conversation("TestPlayer")
+        conv.messages.append(ConversationMessage(
+            timestamp=time.time() - 31 * 86400,
+            role="player",
+            content="Ancient",
+        ))
+        
+        store.add_player_message("TestPlayer", "Fresh")
+        
+        assert [m.content for m in conv.messages] == ["Fresh"]
+    
     def test_get_all_players(self, store):
         store.add_player_message("Player1", "Hello")
         store.add_player_message("Player2", "Hi")
@@ -135,6 +135,35 @@ class TestGeneratedAllowlist:
         
         assert allowlist.is_allowed("kick") is None
 
+    def test_is_allowed_sees_reassigned_entries(self):
+        allowlist = GeneratedAllowlist(
+            generated_at="",
+            allowed=[AllowlistEntry(command="help", max_len=100)],
+        )
+        assert allowlist.is_allowed("status") is None
+        
+        allowlist.allowed = [*allowlist.allowed, AllowlistEntry(command="status", max_len=100)]
+        
+        assert allowlist.is_allowed("status") is not None
+        assert allowlist.is_allowed("help") is not None
+
+    def test_allowed_cannot_change_in_place(self):
+        allowlist = GeneratedAllowlist(
+            generated_at="",
+            allowed=[AllowlistEntry(command="help", max_len=100)],
+        )
+        assert allowlist.is_allowed("help") is not None
+        
+        with pytest.raises(TypeError):
+            allowlist.allowed[0] = AllowlistEntry(command="status", max_len=100)
+        with pytest.raises(AttributeError):
+            allowlist.allowed.append(AllowlistEntry(command="status", max_len=100))
+        with pytest.raises(AttributeError):
+            allowlist.allowed[0].command = "status"
+        
+        assert allowlist.is_allowed("help") is not None
+        assert allowlist.is_allowed("status") is None
+
     def test_save_and_load(self, temp_dir: Path):
         allowlist = GeneratedAllowlist(
             generated_at="2025-12-18T12:00:00",
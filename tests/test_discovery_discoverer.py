@@ -181,6 +181,26 @@ status - Status"""
         assert filepath.suffix == ".json"
         assert len(snapshot.commands) >= 1
 
+    def test_inter_page_delay_adapts_to_latency(self, temp_dir: Path):
+        runner = MockCommandRunner()
+        runner.set_response("help", "help - Lists commands")
+        runner.set_response("help 2", "status - Status")
+        runner.set_response("help 3", "")
+        
+        discoverer = CommandDiscoverer(
+            run_command=runner,
+            server_root=temp_dir,
+            inter_page_delay=0.5,
+            min_inter_page_delay=0.05,
+        )
+        
+        with mock.patch("prefect.discovery.discoverer.time.sleep") as sleep:
+            discoverer.discover()
+        
+        # An instant runner gets the minimum delay, not the 0.5s cap
+        assert [c.args[0] for c in sleep.call_args_list] == [0.05, 0.05]
+        assert discoverer._page_delay(10.0) == 0.5
+
 
 class TestConsoleResult:
     """Tests for ConsoleResult dataclass."""
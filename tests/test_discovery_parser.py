@@ -11,6 +11,7 @@ from prefect.discovery.parser import (
     is_noise_line,
     parse_command_line,
     extract_commands_from_page,
+    extract_commands_from_normalized,
     ParsedCommand,
 )
 
@@ -285,6 +286,12 @@ Page 1
         assert len(results) >= 1
         assert results[0][0].key == "help"
 
+    def test_normalized_variant_matches(self):
+        page = "\x1b[32mhelp\x1b[0m - Lists commands\r\nstatus - Status"
+        assert list(extract_commands_from_normalized(normalize_output(page), 2)) == (
+            extract_commands_from_page(page, 2)
+        )
+
 
 class TestParsedCommand:
     """Tests for ParsedCommand dataclass."""
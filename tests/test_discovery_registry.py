@@ -68,6 +68,14 @@ class TestCommandEntry:
         assert entry.source == "help"
         assert entry.page == 1
 
+    def test_from_dict_round_trips(self):
+        entry = CommandEntry(
+            key="ban", name="ban", syntax="ban <player>", description="Ban a player",
+            source="help", page=3, raw_line="ban <player> - Ban a player",
+        )
+        
+        assert CommandEntry.from_dict(entry.to_dict()) == entry
+
     def test_from_parsed(self):
         parsed = ParsedCommand(
             name="/kick",
@@ -115,6 +123,14 @@ class TestCommandRegistry:
         assert registry.get("KICK") is entry  # normalized lookup
         assert registry.get("/kick") is entry  # slash stripped
 
+    def test_add_normalizes_key(self):
+        registry = CommandRegistry()
+        entry = CommandEntry(key="/Kick", name="/Kick", syntax="", description="", source="help", page=1, raw_line="")
+        registry.add(entry)
+        
+        assert registry.keys() == ["kick"]
+        assert registry.get("kick") is entry
+
     def test_get_missing_returns_none(self):
         registry = CommandRegistry()
         assert registry.get("nonexistent") is None
@@ -0,0 +1,64 @@
+"""Tests for prefect.json_codec module."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from prefect import json_codec
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    """Run each test against orjson (when installed) and the stdlib fallback."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_codec, "orjson", None)
+    elif json_codec.orjson is None:
+        pytest.skip("orjson not installed")
+    return json_codec
+
+
+class TestDumps:
+    """Tests for dumps()."""
+
+    def test_compact_by_default(self, codec):
+        out = codec.dumps({"a": [1, 2], "b": "x"})
+        assert isinstance(out, bytes)
+        assert b" " not in out and b"\n" not in out
+        assert json.loads(out) == {"a": [1, 2], "b": "x"}
+
+    def test_indent(self, codec):
+        out = codec.dumps({"a": 1}, indent=True)
+        assert out == b'{\n  "a": 1\n}'
+
+    def test_non_ascii_round_trips(self, codec):
+        data = {"name": "Zoë"}
+        assert json_codec.loads(codec.dumps(data)) == data
+
+
+@pytest.fixture(params=["ijson", "loads"])
+def streaming_codec(request, monkeypatch):
+    """Run each test with ijson streaming (when installed) and the full-load fallback."""
+    if request.param == "loads":
+        monkeypatch.setattr(json_codec, "ijson", None)
+    elif json_codec.ijson is None:
+        pytest.skip("ijson not installed")
+    return json_codec
+
+
+class TestIterArray:
+    """Tests for iter_array()."""
+
+    def test_yields_items(self, streaming_codec, tmp_path):
+        path = tmp_path / "data.json"
+        path.write_text(json.dumps({"meta": {}, "commands": [{"name": "help", "page": 1}, {"name": "kick"}]}))
+        
+        items = list(streaming_codec.iter_array(path, "commands"))
+        
+        assert items == [{"name": "help", "page": 1}, {"name": "kick"}]
+
+    def test_missing_key_yields_nothing(self, streaming_codec, tmp_path):
+        path = tmp_path / "data.json"
+        path.write_text("{}")
+        
+        assert list(streaming_codec.iter_array(path, "commands")) == []
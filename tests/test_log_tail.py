@@ -61,6 +61,35 @@ class TestRollingLogBuffer:
         assert len(lines) == 5
         assert lines == ["line5", "line6", "line7", "line8", "line9"]
 
+    def test_len(self):
+        buf = RollingLogBuffer(max_lines=2)
+        assert len(buf) == 0
+        buf.extend(["one", "", "two", "three"])
+        assert len(buf) == 2
+
+    def test_wait_for_lines_returns_only_new(self):
+        buf = RollingLogBuffer(max_lines=3)
+        buf.extend(["a", "b"])
+        seen = buf.total_appended()
+        buf.extend(["c", "d", "e", "f"])
+        
+        total, lines = buf.wait_for_lines(seen, timeout=0)
+        
+        assert total == 6
+        assert lines == ["d", "e", "f"]  # "c" was already evicted
+
+    def test_wait_for_lines_wakes_on_append(self):
+        buf = RollingLogBuffer(max_lines=10)
+        timer = threading.Timer(0.1, buf.append, args=("ready",))
+        timer.start()
+        try:
+            total, lines = buf.wait_for_lines(0, timeout=5)
+        finally:
+            timer.cancel()
+        
+        assert (total, lines) == (1, ["ready"])
+        assert buf.wait_for_lines(total, timeout=0.01) == (1, [])
+
     def test_get_since(self):
         buf = RollingLogBuffer(max_lines=100)
         t1 = time.time()
@@ -87,6 +116,17 @@ class TestRollingLogBuffer:
         assert line == "late"
         assert ts >= t2
 
+    def test_get_since_keeps_order(self):
+        buf = RollingLogBuffer(max_lines=100)
+        buf.append("old")
+        time.sleep(0.01)
+        cutoff = time.time()
+        buf.extend(["a", "b", "c"])
+        
+        assert buf.get_since(cutoff) == ["a", "b", "c"]
+        assert [line for _, line in buf.get_since_with_ts(cutoff)] == ["a", "b", "c"]
+        assert buf.get_since(time.time() + 60) == []
+
     def test_search(self):
         buf = RollingLogBuffer(max_lines=100)
         buf.append("INFO: Server started")
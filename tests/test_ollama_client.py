@@ -0,0 +1,89 @@
+"""Tests for prefect.ollama_client module."""
+from __future__ import annotations
+
+import asyncio
+
+from prefect.ollama_client import OllamaClient, OllamaConfig
+
+
+def _client() -> OllamaClient:
+    return OllamaClient(OllamaConfig(base_url="http://127.0.0.1:11434", model="test"))
+
+
+class TestOllamaClientPool:
+    """Tests for the shared httpx connection pool."""
+
+    def test_reused_within_loop(self):
+        client = _client()
+        
+        async def _run():
+            async with client._client() as first:
+                pass
+            async with client._client() as second:
+                pass
+            assert first is second
+            assert not first.is_closed
+            await client.aclose()
+            assert first.is_closed
+        
+        asyncio.run(_run())
+
+    def test_other_loop_gets_own_client(self):
+        client = _client()
+        
+        async def _grab():
+            async with client._client() as c:
+                return c
+        
+        loop = asyncio.new_event_loop()
+        try:
+            shared = loop.run_until_complete(_grab())
+            # A different live loop must not borrow the pool bound to `loop`.
+            other = asyncio.new_event_loop()
+            try:
+                assert other.run_until_complete(_grab()) is not shared
+            finally:
+                other.close()
+            assert loop.run_until_complete(_grab()) is shared
+            loop.run_until_complete(client.aclose())
+        finally:
+            loop.close()
+
+    def test_aclose_from_other_loop_leaves_pool_alone(self):
+        client = _client()
+        
+        async def _grab():
+            async with client._client() as c:
+                return c
+        
+        loop = asyncio.new_event_loop()
+        try:
+            shared = loop.run_until_complete(_grab())
+            asyncio.run(client.aclose())
+            assert not shared.is_closed
+            assert loop.run_until_complete(_grab()) is shared
+            loop.run_until_complete(client.aclose())
+            assert shared.is_closed
+        finally:
+            loop.close()
+
+    def test_pool_from_closed_loop_is_closed_and_replaced(self):
+        client = _client()
+        
+        async def _grab():
+            async with client._client() as c:
+                return c
+        
+        loop = asyncio.new_event_loop()
+        stale = loop.run_until_complete(_grab())
+        loop.close()
+        
+        async def _grab_and_close():
+            fresh = await _grab()
+            await client.aclose()
+            return fresh
+        
+        fresh = asyncio.run(_grab_and_close())
+        
+        assert fresh is not stale
+        assert stale.is_closed
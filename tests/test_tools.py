@@ -1,6 +1,8 @@
 """Integration tests for prefect.mcp.tools.PrefectCore."""
 from __future__ import annotations
 
+import asyncio
+import threading
 import time
 from pathlib import Path
 from unittest import mock
@@ -9,6 +11,7 @@ import pytest
 
 from prefect.config import PrefectSettings
 from prefect.mcp.tools import PrefectCore, _coerce_safe_chat_text, _looks_like_unknown_command
+from prefect.persona import PersonaManager
 from prefect.server_control.controller import TmuxAttachController
 
 
@@ -75,6 +78,20 @@ class TestPrefectCoreInit:
         assert core.log_buffer is not None
         assert core.persona_manager is not None
 
+    def test_agent_components_created_on_first_use(self, temp_dir: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+        )
+        core = PrefectCore(settings)
+        assert "conversation_store" not in core.__dict__
+        assert "ollama" not in core.__dict__
+        
+        store = core.conversation_store
+        assert core.conversation_store is store
+        core.shutdown()  # flushes only what was created
+        assert "bedrock_conversation_store" not in core.__dict__
+
     def test_loads_command_names(self, temp_dir: Path, commands_json: Path):
         settings = PrefectSettings(
             server_root=temp_dir,
@@ -189,6 +206,168 @@ class TestPrefectCoreChatEvents:
         assert "joined" in events[0][1]
         assert "left" in events[1][1]
 
+    def test_joins_welcomed_by_worker_thread(self, temp_dir: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+        )
+        core = PrefectCore(settings)
+        handled = []
+        done = threading.Event()
+        core._handle_player_join = lambda name: handled.append(("necesse", name))
+        def _bedrock_join(name):
+            handled.append(("bedrock", name))
+            done.set()
+        core._handle_bedrock_player_join = _bedrock_join
+        
+        core._on_activity("join", "Player1")
+        core._on_bedrock_activity("join", "Player2")
+        assert handled == []  # queued until the worker runs
+        
+        core._start_welcome_thread()
+        try:
+            assert done.wait(timeout=5)
+        finally:
+            core._chat_stop.set()
+        assert handled == [("necesse", "Player1"), ("bedrock", "Player2")]
+
+    def test_join_queue_is_bounded(self, temp_dir: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+        )
+        with mock.patch("prefect.mcp.tools._JOIN_QUEUE_MAX", 2):
+            core = PrefectCore(settings)
+            for name in ("P1", "P2", "P3", "P3", "P4"):
+                core._queue_player_join("necesse", name)
+                assert len(core._join_queue) <= 2
+        
+        assert list(core._join_queue) == [("necesse", "P1"), ("necesse", "P2")]
+        assert core._unwelcomed_joins == {("necesse", "P3"): 2, ("necesse", "P4"): 1}
+        assert core._join_wakeup.is_set()
+
+    def test_overflow_joins_recorded_without_welcome(self, temp_dir: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+        )
+        core = PrefectCore(settings)
+        tracker = mock.Mock()
+        core.__dict__["player_tracker"] = tracker
+        welcomed = []
+        core._handle_player_join = welcomed.append
+        core._join_queue.append(("necesse", "P1"))
+        core._unwelcomed_joins[("necesse", "P2")] += 2
+        
+        core._start_welcome_thread()
+        try:
+            deadline = time.monotonic() + 5
+            while tracker.record_join.call_count < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            core._chat_stop.set()
+        
+        assert welcomed == ["P1"]
+        assert tracker.record_join.call_args_list == [mock.call("P2"), mock.call("P2")]
+        assert not core._unwelcomed_joins
+
+    def test_chat_batch_keeps_latest_per_player(self, temp_dir: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+        )
+        core = PrefectCore(settings)
+        core._chat_queue.append(("necesse", "Bob", "prefect hi"))
+        core._chat_queue.append(("necesse", "alice", "prefect what time is it?"))
+        core._chat_queue.append(("bedrock", "Alice", "prefect hello"))
+        
+        batch = core._drain_chat_batch(("necesse", "Alice", "prefect hey"))
+        
+        assert batch == [
+            ("necesse", "alice", "prefect what time is it?"),
+            ("necesse", "Bob", "prefect hi"),
+            ("bedrock", "Alice", "prefect hello"),
+        ]
+
+    def test_chat_worker_woken_by_mention(self, temp_dir: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+        )
+        core = PrefectCore(settings)
+        handled = threading.Event()
+        core._handle_chat_mention = lambda kind, player, message: handled.set()
+        
+        core._start_chat_thread()
+        try:
+            core._on_chat_mention("Alice", "prefect hi")
+            assert handled.wait(timeout=5)
+        finally:
+            core._chat_stop.set()
+        assert not core._chat_queue
+
+    def test_chat_batch_replies_generated_concurrently(self, temp_dir: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+        )
+        core = PrefectCore(settings)
+        active = 0
+        peak = 0
+        
+        async def _generate(system_prompt, user_prompt, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+            return "hello"
+        
+        core.ollama = mock.Mock(generate=_generate, aclose=mock.AsyncMock())
+        core.conversation_store = mock.Mock()
+        core.conversation_store.get_view.return_value = mock.Mock(context="", total_messages=0)
+        try:
+            with mock.patch.object(core, "announce", return_value={"ok": True, "sent": True}) as announce:
+                core._handle_chat_batch([
+                    ("necesse", "Alice", "prefect hi"),
+                    ("necesse", "Bob", "prefect hey"),
+                ])
+        finally:
+            core.shutdown()
+        
+        assert peak == 2
+        assert sorted(c.args[0] for c in announce.call_args_list) == ["@Alice hello", "@Bob hello"]
+
+    def test_reply_cooldowns_are_bounded(self, temp_dir: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+        )
+        core = PrefectCore(settings)
+        
+        with mock.patch("prefect.mcp.tools._PLAYER_COOLDOWN_MAX", 2), \
+                mock.patch.object(core, "_respond_to_player") as respond:
+            for player in ("a", "b", "c"):
+                core._handle_chat_mention("necesse", player, "prefect hi")
+        
+        assert respond.call_count == 3
+        assert list(core._last_player_reply_ts) == ["necesse:b", "necesse:c"]
+
+    def test_expired_reply_cooldowns_dropped(self, temp_dir: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+            chat_cooldown_seconds=10,
+        )
+        core = PrefectCore(settings)
+        core._last_player_reply_ts["necesse:old"] = time.time() - 60
+        core._last_player_reply_ts["necesse:recent"] = time.time() - 1
+        
+        with mock.patch.object(core, "_respond_to_player"):
+            core._handle_chat_mention("necesse", "new", "prefect hi")
+        
+        assert list(core._last_player_reply_ts) == ["necesse:recent", "necesse:new"]
+
     def test_get_events_since_ts(self, temp_dir: Path):
         settings = PrefectSettings(
             server_root=temp_dir,
@@ -206,6 +385,48 @@ class TestPrefectCoreChatEvents:
         assert len(events) == 1
         assert events[0][1] == "Late"
 
+    def test_get_activity_events_since_ts_keeps_order(self, temp_dir: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+        )
+        core = PrefectCore(settings)
+        
+        core._on_activity("leave", "Early")
+        time.sleep(0.01)
+        cutoff = time.time()
+        core._on_activity("leave", "Second")
+        core._on_activity("leave", "Third")
+        
+        events = core.get_activity_events(since_ts=cutoff)
+        assert [text for _, text in events] == ["Second left", "Third left"]
+
+
+class TestPrefectCoreWaitUntilReady:
+    """Tests for PrefectCore.wait_until_ready."""
+
+    def test_ready_from_backlog(self, temp_dir: Path):
+        core = PrefectCore(PrefectSettings(server_root=temp_dir, start_server=False))
+        core.log_buffer.append("Server Started on port 14159")
+        
+        assert core.wait_until_ready(timeout_seconds=1)["ready"] is True
+
+    def test_ready_from_new_line(self, temp_dir: Path):
+        core = PrefectCore(PrefectSettings(server_root=temp_dir, start_server=False))
+        core.log_buffer.append("Booting")
+        timer = threading.Timer(0.6, core.log_buffer.append, args=("Listening for players",))
+        timer.start()
+        try:
+            assert core.wait_until_ready(timeout_seconds=5)["ready"] is True
+        finally:
+            timer.cancel()
+
+    def test_times_out(self, temp_dir: Path):
+        core = PrefectCore(PrefectSettings(server_root=temp_dir, start_server=False))
+        core.log_buffer.append("Booting")
+        
+        assert core.wait_until_ready(timeout_seconds=0.1)["ready"] is False
+
 
 class TestPrefectCoreOllama:
     """Tests for PrefectCore Ollama integration."""
@@ -250,9 +471,120 @@ class TestPrefectCoreOllama:
         assert "error" in result
 
 
+    def test_ollama_calls_share_one_event_loop(self, temp_dir: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+        )
+        core = PrefectCore(settings)
+        
+        async def _current_loop():
+            return asyncio.get_running_loop()
+        
+        try:
+            first = core._run_coro(_current_loop())
+            assert core._run_coro(_current_loop()) is first
+        finally:
+            core.shutdown()
+        assert core._aio_loop is None
+
+    def test_summarize_recent_logs_runs_on_background_loop(self, temp_dir: Path):
+        core = PrefectCore(PrefectSettings(server_root=temp_dir, start_server=False))
+        loops = []
+        
+        async def _generate(*args, **kwargs):
+            loops.append(asyncio.get_running_loop())
+            return " summary "
+        
+        core.__dict__["ollama"] = mock.Mock(generate=_generate)
+        try:
+            result = asyncio.run(core.summarize_recent_logs(n=5))
+            assert result == {"ok": True, "summary": "summary"}
+            assert loops == [core._aio_loop]
+        finally:
+            core.__dict__.pop("ollama")
+            core.shutdown()
+
+    def test_shutdown_closes_ollama_pool_before_stopping_loop(self, temp_dir: Path):
+        core = PrefectCore(PrefectSettings(server_root=temp_dir, start_server=False))
+        events: list[str] = []
+        
+        async def _aclose():
+            loop = asyncio.get_running_loop()
+            await asyncio.sleep(0.05)
+            events.append("closed" if loop is core._aio_loop and loop.is_running() else "wrong loop")
+        
+        async def _current_loop():
+            return asyncio.get_running_loop()
+        
+        core.__dict__["ollama"] = mock.Mock(aclose=_aclose)
+        loop = core._run_coro(_current_loop())
+        
+        core.shutdown()
+        
+        assert events == ["closed"]
+        deadline = time.monotonic() + 2
+        while loop.is_running() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not loop.is_running()
+
+
+class TestPrefectCorePersonaPrompt:
+    """Tests for the cached active persona prompt."""
+
+    def test_prompt_cached_until_persona_changes(self, temp_dir: Path, personas_json: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+        )
+        core = PrefectCore(settings)
+        core.persona_manager = PersonaManager(personas_json)
+        
+        persona, prompt = core._get_active_prompt()
+        assert persona.name == "TestPersona"
+        assert core._get_active_prompt()[1] is prompt
+        
+        persona.persona_prompt = "Be terse."
+        assert core._get_active_prompt()[1].endswith("Personality: Be terse.")
+        
+        core.persona_manager.set_active("Default")
+        assert core._get_active_prompt()[1].startswith("You are a test assistant.")
+
+
 class TestPrefectCoreAnnounce:
     """Tests for PrefectCore.announce method."""
 
+    def test_templates_parsed_once(self, temp_dir: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+            announce_command_templates=" broadcast {message}, ,say {message} ",
+            bedrock_announce_command_templates="",
+        )
+        core = PrefectCore(settings)
+        
+        assert core._announce_templates == ("broadcast {message}", "say {message}")
+        assert core._bedrock_announce_templates == ("say {message}",)
+        assert core.allowlist.is_allowed("broadcast hello")
+
+    def test_trusted_templates_skip_revalidation(self, temp_dir: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+            announce_command_templates="say {message},{message} now,say $ {message}",
+        )
+        core = PrefectCore(settings)
+        
+        assert core._announce_parts == (("say ", ""), None, None)
+        with mock.patch.object(core.command_runner, "run") as run, \
+                mock.patch.object(core, "run_command") as run_command:
+            run.return_value = mock.Mock(ok=True, output="")
+            result = core.announce("hello there")
+        
+        assert result == {"ok": True, "sent": True}
+        run.assert_called_once_with("say hello there")
+        run_command.assert_not_called()
+
     def test_rejects_unsafe_message(self, temp_dir: Path):
         settings = PrefectSettings(
             server_root=temp_dir,
@@ -277,3 +609,62 @@ class TestPrefectCoreAnnounce:
         
         assert result["ok"] is False
         assert "empty" in result["error"]
+
+
+class TestPrefectCoreKillZombies:
+    """Tests for PrefectCore zombie process cleanup."""
+
+    def test_signals_pids_from_single_pgrep(self, temp_dir: Path):
+        core = PrefectCore(PrefectSettings(server_root=temp_dir, start_server=False))
+        pgrep = mock.Mock(stdout="101\n202\n")
+        
+        with mock.patch("prefect.mcp.tools.subprocess.run", return_value=pgrep) as run, \
+                mock.patch("prefect.mcp.tools.os.kill") as kill:
+            result = core.kill_zombie_processes()
+        
+        run.assert_called_once()
+        assert run.call_args.args[0] == ["pgrep", "-f", "Server.jar|StartServer"]
+        assert [c.args[0] for c in kill.call_args_list] == [101, 202]
+        assert result["ok"] is True
+        assert result["pids"] == [101, 202]
+
+    def test_nothing_to_kill(self, temp_dir: Path):
+        core = PrefectCore(PrefectSettings(server_root=temp_dir, start_server=False))
+        
+        with mock.patch("prefect.mcp.tools.subprocess.run", return_value=mock.Mock(stdout="")), \
+                mock.patch("prefect.mcp.tools.os.kill") as kill:
+            result = core.kill_zombie_processes()
+        
+        kill.assert_not_called()
+        assert result == {
+            "ok": True,
+            "message": "Sent kill signals to 0 process(es) matching: Server.jar, StartServer",
+            "pids": [],
+        }
+
+    def test_local_chat_mention_is_case_insensitive(self, temp_dir: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+        )
+        core = PrefectCore(settings)
+        
+        with mock.patch.object(core, "_on_chat_mention") as on_mention:
+            core.send_chat_message("hey PREFECT, status?")
+            core.send_chat_message("nothing to see here")
+        
+        on_mention.assert_called_once_with("Admin", "hey PREFECT, status?")
+
+    def test_mentions_ignored_when_disabled(self, temp_dir: Path):
+        settings = PrefectSettings(
+            server_root=temp_dir,
+            start_server=False,
+            chat_mention_enabled=False,
+        )
+        core = PrefectCore(settings)
+        
+        with mock.patch.object(core, "_on_chat_mention") as on_mention:
+            core.send_chat_message("prefect hello")
+        
+        assert core._mention_re is None
+        on_mention.assert_not_called()